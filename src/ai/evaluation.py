@@ -0,0 +1,74 @@
+"""Evaluations of the fields reached by the search."""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from ai.field import Field
+
+# Scores a field given the rows cleared on the way to it. Higher is better.
+# Evaluations are sent to the worker processes, so they must be picklable:
+# module level functions or instances of module level classes.
+Evaluation = Callable[["Field", int], float]
+
+
+@dataclass(frozen=True)
+class Features:
+    """Board features commonly weighted by stacking bots."""
+
+    height: int
+    max_height: int
+    holes: int
+    bumpiness: int
+    cheese: int
+    lines: int
+
+    @classmethod
+    def of(cls, field: "Field", lines: int) -> "Features":
+        """Extracts the features of `field`, reached by clearing `lines` rows.
+
+        `height` is the sum of the column heights, `holes` counts the empty
+        cells below the top of their column, `bumpiness` sums the height
+        differences of adjacent columns and `cheese` counts the rows which
+        still contain garbage.
+        """
+        heights = [column.bit_length() for column in field.columns]
+        filled = sum(column.bit_count() for column in field.columns)
+        height = sum(heights)
+        return cls(
+            height,
+            max(heights),
+            height - filled,
+            sum(abs(a - b) for a, b in zip(heights, heights[1:])),
+            field.garbage.bit_count(),
+            lines,
+        )
+
+
+@dataclass(frozen=True)
+class LinearEvaluation:
+    """Weighted sum of the features of a field."""
+
+    height: float = -0.5
+    max_height: float = -0.3
+    holes: float = -2.0
+    bumpiness: float = -0.2
+    cheese: float = -1.5
+    lines: float = 0.5
+
+    def __call__(self, field: "Field", lines: int) -> float:
+        features = Features.of(field, lines)
+        return (
+            self.height * features.height
+            + self.max_height * features.max_height
+            + self.holes * features.holes
+            + self.bumpiness * features.bumpiness
+            + self.cheese * features.cheese
+            + self.lines * features.lines
+        )
+
+
+EVALUATIONS: "dict[str, Evaluation]" = {
+    "default": LinearEvaluation(),
+    "downstack": LinearEvaluation(height=-0.2, holes=-1.0, cheese=-4.0, lines=1.0),
+}
@@ -0,0 +1,117 @@
+"""Occupancy-only board used by the search."""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from model.board import Board
+    from model.placement import Placement
+    from model.shape import Shape
+
+
+@dataclass(frozen=True)
+class Field:
+    """Occupancy-only copy of a board, cheap enough to create for every node of
+    the search. Rows and columns are kept as bitmasks, as in `Board`, along
+    with a mask of the rows that contain garbage. It offers the collision
+    queries `PlacementFinder` needs, and `key` matches `Board.key`, so results
+    memoized for a board are shared with the equivalent field.
+    """
+
+    num_cols: int
+    rows: tuple[int, ...]
+    columns: tuple[int, ...]
+    garbage: int = 0
+
+    @property
+    def key(self) -> tuple[int, ...]:
+        """Occupancy masks of all rows, bottom row first."""
+        return self.rows
+
+    @property
+    def heights(self) -> list[int]:
+        """The height of the highest occupied cell of each column."""
+        return [column.bit_length() for column in self.columns]
+
+    def drop_distance(self, shape: "Shape", x: int, y: int) -> int:
+        """Returns the number of rows `shape`, placed without collision with its
+        origin at (`x`, `y`), can drop before landing on a cell or the floor.
+        """
+        distance = len(self.rows)
+        for dx, dy in shape.bottoms:
+            row = y + dy
+            below = self.columns[x + dx] & ((1 << row) - 1)
+            distance = min(distance, row - below.bit_length())
+        return distance
+
+    def has_collision_at(self, shape: "Shape", x: int, y: int) -> bool:
+        """Checks if `shape` placed with its origin at (`x`, `y`) has collision
+        with any cells in the field or the walls.
+        """
+        if (
+            x + shape.left < 0
+            or x + shape.right >= self.num_cols
+            or y + shape.bottom < 0
+            or y + shape.top >= len(self.rows)
+        ):
+            return True
+        for dy, bits in shape.rows:
+            if self.rows[y + dy] & (bits << x if x >= 0 else bits >> -x):
+                return True
+        return False
+
+    def place(self, shape: "Shape", placement: "Placement") -> "tuple[Field, int, int]":
+        """Locks `shape` at `placement` and clears the full rows.
+
+        Returns:
+            The resulting field, the number of rows cleared and the number of
+            garbage rows among them.
+        """
+        x, y = placement.x, placement.y
+        rows = list(self.rows)
+        for dy, bits in shape.rows:
+            rows[y + dy] |= bits << x if x >= 0 else bits >> -x
+        columns = list(self.columns)
+        for dx, dy in shape.cells:
+            columns[x + dx] |= 1 << (y + dy)
+
+        full = (1 << self.num_cols) - 1
+        full_rows = [y + dy for dy, _ in shape.rows if rows[y + dy] == full]
+        if not full_rows:
+            return Field(self.num_cols, tuple(rows), tuple(columns), self.garbage), 0, 0
+
+        return self._clear(rows, columns, full_rows)
+
+    def _clear(
+        self, rows: list[int], columns: list[int], full_rows: list[int]
+    ) -> "tuple[Field, int, int]":
+        """Removes `full_rows`, listed bottom first, from `rows` and `columns`,
+        which hold the field with the piece locked.
+        """
+        garbage = self.garbage
+        num_garbage = 0
+        for row in reversed(full_rows):
+            below = (1 << row) - 1
+            columns = [
+                column & below | column >> (row + 1) << row for column in columns
+            ]
+            num_garbage += garbage >> row & 1
+            garbage = garbage & below | garbage >> (row + 1) << row
+            del rows[row]
+        rows.extend([0] * len(full_rows))
+        return (
+            Field(self.num_cols, tuple(rows), tuple(columns), garbage),
+            len(full_rows),
+            num_garbage,
+        )
+
+    @classmethod
+    def from_board(cls, board: "Board") -> "Field":
+        """Copies the occupancy of `board`."""
+        rows = board.key
+        num_cols = len(board.heights)
+        columns = tuple(
+            sum((row >> col & 1) << y for y, row in enumerate(rows))
+            for col in range(num_cols)
+        )
+        return cls(num_cols, rows, columns, board.garbage_rows)
@@ -0,0 +1,355 @@
+"""Time-budgeted beam search over reachable placements."""
+
+import heapq
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from ai.evaluation import LinearEvaluation
+from ai.field import Field
+from common.enum import Action
+from model.placement import PlacementFinder
+
+if TYPE_CHECKING:
+    from ai.evaluation import Evaluation
+    from common.enum import Mino
+    from model.placement import Placement
+    from model.ruleset import Ruleset
+    from model.stacker import Stacker
+
+
+@dataclass(frozen=True)
+class SearchState:
+    """What the search sees of the stacker: the field, the current piece
+    followed by the previews, and the hold.
+    """
+
+    field: Field
+    queue: "tuple[Mino, ...]"
+    held: "Mino | None" = None
+    can_hold: bool = True
+
+    @property
+    def max_depth(self) -> int:
+        """Number of pieces every line of play can place. Holding into an empty
+        hold uses up one extra piece of the queue.
+        """
+        return len(self.queue) - (self.held is None)
+
+    @classmethod
+    def from_stacker(cls, stacker: "Stacker") -> "SearchState":
+        """Captures the state of `stacker`."""
+        held = stacker.held
+        return cls(
+            Field.from_board(stacker.board),
+            (stacker.current.mino, *(piece.mino for piece in stacker.previews)),
+            None if held is None else held.mino,
+            stacker.can_hold,
+        )
+
+
+@dataclass(frozen=True)
+class Move:
+    """One placement of a plan. `actions` starts with a hold when the piece is
+    swapped in from the hold.
+    """
+
+    mino: "Mino"
+    placement: "Placement"
+    actions: tuple[Action, ...]
+
+
+@dataclass(frozen=True)
+class Plan:
+    """The best placement sequence found by a search."""
+
+    moves: tuple[Move, ...]
+    score: float
+    nodes: int
+    elapsed_ns: int
+
+    @property
+    def actions(self) -> tuple[Action, ...]:
+        """The inputs of the first move, the only one which is certain to be
+        played as planned.
+        """
+        return self.moves[0].actions
+
+    @property
+    def nodes_per_sec(self) -> float:
+        """Nodes expanded per second of search."""
+        return self.nodes * 1e9 / self.elapsed_ns if self.elapsed_ns else 0.0
+
+
+@dataclass(frozen=True)
+class Node:
+    """A field reached by the search and the moves which led to it. `index` is
+    the position in the queue of the next piece to place.
+    """
+
+    field: Field
+    index: int
+    held: "Mino | None"
+    moves: tuple[Move, ...]
+    lines: int
+    score: float
+
+
+def _score(node: Node) -> float:
+    return node.score
+
+
+@dataclass
+class BeamSearch:
+    """Beam search over the placements reachable by the pieces of the queue.
+
+    Every layer places one more piece, and only the `width` best fields of a
+    layer according to `evaluation` are expanded. Fields reached in different
+    orders are merged. The search ends with the queue or once `budget_ms`
+    milliseconds have passed, whichever comes first, and plans for the best
+    field of the deepest layer reached. The placements of the current piece
+    are always searched in full, so a plan is found whatever the budget.
+    Without a budget the result only depends on the state.
+
+    Upcoming cheese is not known to the search and is not simulated.
+    """
+
+    ruleset: "Ruleset"
+    evaluation: "Evaluation" = field(default_factory=LinearEvaluation)
+    width: int = 32
+    budget_ms: float | None = 100.0
+    finder: PlacementFinder = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.finder = PlacementFinder(self.ruleset)
+
+    @property
+    def budget_ns(self) -> int | None:
+        """The budget in nanoseconds."""
+        return None if self.budget_ms is None else int(self.budget_ms * 1_000_000)
+
+    def search(self, state: SearchState) -> Plan | None:
+        """Returns the best plan for `state`, or None if the current piece
+        cannot be placed.
+        """
+        start = time.perf_counter_ns()
+        roots = self.roots(state)
+        budget_ns = self.budget_ns
+        deadline = None if budget_ns is None else start + budget_ns
+        best, nodes = self.descend(roots, state.queue, state.max_depth, deadline)
+        return self.plan(best, len(roots) + nodes, start)
+
+    def roots(self, state: SearchState) -> list[Node]:
+        """Places the current piece, and the held or the next piece instead if
+        holding is allowed. Returns the distinct fields, best first.
+        """
+        root = Node(state.field, 0, state.held, (), 0, 0.0)
+        layer = _merge(self._children(root, state.queue, state.can_hold))
+        return sorted(layer, key=_score, reverse=True)
+
+    def descend(
+        self,
+        layer: list[Node],
+        queue: "tuple[Mino, ...]",
+        max_depth: int,
+        deadline: int | None = None,
+    ) -> tuple[Node | None, int]:
+        """Searches below `layer` until `max_depth` pieces are placed or the
+        `perf_counter_ns` deadline passes. The deadline is checked before every
+        placement, and fields are expanded best first, so a layer cut short by
+        the deadline holds the children of the best fields of the layer before.
+
+        Returns:
+            The best node of the deepest layer reached and the number of nodes
+            expanded.
+        """
+        layer = heapq.nlargest(self.width, layer, key=_score)
+        best = layer[0] if layer else None
+        nodes = 0
+        expired = False
+        for _ in range(len(best.moves) if best else max_depth, max_depth):
+            children: list[Node] = []
+            for node in layer:
+                children.extend(self._children(node, queue, True, deadline))
+                if deadline is not None and time.perf_counter_ns() >= deadline:
+                    expired = True
+                    break
+            nodes += len(children)
+            if not children:
+                break
+            layer = heapq.nlargest(self.width, _merge(children), key=_score)
+            best = layer[0]
+            if expired:
+                break
+        return best, nodes
+
+    @staticmethod
+    def plan(best: Node | None, nodes: int, start: int) -> Plan | None:
+        """Wraps the best node of a search which started at `start`."""
+        if best is None:
+            return None
+        elapsed_ns = time.perf_counter_ns() - start
+        return Plan(best.moves, best.score, nodes, elapsed_ns)
+
+    def _children(
+        self,
+        node: Node,
+        queue: "tuple[Mino, ...]",
+        can_hold: bool,
+        deadline: int | None = None,
+    ) -> Iterator[Node]:
+        mino = queue[node.index]
+        yield from self._place(node, mino, node.held, node.index + 1, (), deadline)
+        if not can_hold:
+            return
+        if node.held is None:
+            if node.index + 1 < len(queue):
+                next_mino = queue[node.index + 1]
+                yield from self._place(
+                    node, next_mino, mino, node.index + 2, (Action.HOLD,), deadline
+                )
+        elif node.held != mino:
+            yield from self._place(
+                node, node.held, mino, node.index + 1, (Action.HOLD,), deadline
+            )
+
+    def _place(
+        self,
+        node: Node,
+        mino: "Mino",
+        held: "Mino | None",
+        index: int,
+        prefix: tuple[Action, ...],
+        deadline: int | None,
+    ) -> Iterator[Node]:
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        shapes = self.ruleset.shapes[mino]
+        placements = self.finder.find(node.field, mino)
+        for placement, actions in placements.items():
+            if deadline is not None and time.perf_counter_ns() >= deadline:
+                return
+            field_, lines, _ = node.field.place(shapes[placement.rot], placement)
+            lines += node.lines
+            yield Node(
+                field_,
+                index,
+                held,
+                (*node.moves, Move(mino, placement, (*prefix, *actions))),
+                lines,
+                self.evaluation(field_, lines),
+            )
+
+
+def _merge(nodes: Iterable[Node]) -> list[Node]:
+    """Keeps the best scored of the nodes which share a field, hold and queue
+    position.
+    """
+    merged: dict[tuple, Node] = {}
+    for node in nodes:
+        key = (node.field.rows, node.index, node.held)
+        if (other := merged.get(key)) is None or node.score > other.score:
+            merged[key] = node
+    return list(merged.values())
+
+
+_WORKER_SEARCH: BeamSearch | None = None
+
+
+def _init_worker(search: BeamSearch) -> None:
+    global _WORKER_SEARCH  # pylint: disable=global-statement
+    _WORKER_SEARCH = search
+
+
+def _descend_in_worker(
+    layer: list[Node],
+    queue: "tuple[Mino, ...]",
+    max_depth: int,
+    budget_ns: int | None,
+    sent_ns: int,
+) -> tuple[Node | None, int]:
+    assert _WORKER_SEARCH is not None
+    deadline = None
+    if budget_ns is not None:
+        # perf_counter_ns is not comparable between processes, so the time the
+        # work took to arrive is measured with the wall clock.
+        transit_ns = max(0, time.time_ns() - sent_ns)
+        deadline = time.perf_counter_ns() + budget_ns - transit_ns
+    return _WORKER_SEARCH.descend(layer, queue, max_depth, deadline)
+
+
+@dataclass
+class ParallelBeamSearch:
+    """Root-level parallel beam search. The placements of the current piece are
+    dealt out to a pool of worker processes, each of which searches below its
+    share with a beam of its own, and the plan of the deepest, best scored node
+    among the workers wins. The pool is kept for later searches until `close`
+    is called, and started over when `num_workers` or the configuration of
+    `search` the workers were given has changed.
+    """
+
+    search: BeamSearch
+    num_workers: int | None = None
+    _executor: ProcessPoolExecutor | None = field(default=None, init=False)
+    _config: tuple | None = field(default=None, init=False)
+
+    def __enter__(self) -> "ParallelBeamSearch":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def run(self, state: SearchState) -> Plan | None:
+        """Returns the best plan for `state`, or None if the current piece
+        cannot be placed. Placing the current piece and sending the work to
+        the workers count against the budget. Sending the results back does
+        not, so the plan arrives up to that much later than the budget.
+        """
+        start = time.perf_counter_ns()
+        roots = self.search.roots(state)
+        num_workers = self.num_workers or os.cpu_count() or 1
+        shares = [roots[i::num_workers] for i in range(min(num_workers, len(roots)))]
+        budget_ns = self.search.budget_ns
+        if budget_ns is not None:
+            budget_ns -= time.perf_counter_ns() - start
+        executor = self._get_executor(num_workers)
+        sent_ns = time.time_ns()
+        futures = [
+            executor.submit(
+                _descend_in_worker,
+                share,
+                state.queue,
+                state.max_depth,
+                budget_ns,
+                sent_ns,
+            )
+            for share in shares
+        ]
+        results = [future.result() for future in futures]
+        best = max(
+            (node for node, _ in results if node is not None),
+            key=lambda node: (len(node.moves), node.score),
+            default=None,
+        )
+        nodes = len(roots) + sum(nodes for _, nodes in results)
+        return self.search.plan(best, nodes, start)
+
+    def close(self) -> None:
+        """Shuts the worker pool down."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _get_executor(self, num_workers: int) -> ProcessPoolExecutor:
+        # The budget is sent with every search, the rest is copied once.
+        search = self.search
+        config = (num_workers, search, search.ruleset, search.evaluation, search.width)
+        if self._config != config:
+            self.close()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                num_workers, initializer=_init_worker, initargs=(search,)
+            )
+            self._config = config
+        return self._executor
@@ -0,0 +1,232 @@
+"""Seeded fixtures and the hot paths measured by the benchmark suite."""
+
+import random
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable
+
+from pygame.surface import Surface
+
+from ai.search import BeamSearch, SearchState
+from client.atlas import SpriteAtlas
+from client.cells import Cells
+from client.geometry import Geometry
+from client.view import DEFAULT_SIZE, View
+from common.enum import Mino
+from common.vector import Vector2D
+from model.bag import Bag
+from model.board import Board
+from model.garbage import CheeseGenerator
+from model.piece import Piece
+from model.randomizer import RANDOMIZERS, Randomizer
+from model.stacker import Snapshot, Stacker
+
+if TYPE_CHECKING:
+    from client.controls import Controls
+    from model.ruleset import Ruleset
+
+
+@dataclass(frozen=True)
+class Fixtures:
+    """Everything a case needs to build its state."""
+
+    ruleset: "Ruleset"
+    controls: "Controls"
+    font: Any
+
+
+@dataclass(frozen=True)
+class Case:
+    """One benchmarked operation.
+
+    `setup` builds the state from the fixtures and a seeded generator and `run`
+    performs the operation once on it. States are built before timing starts;
+    when `mutates` is set, every call gets a state of its own.
+    """
+
+    name: str
+    setup: Callable[[Fixtures, random.Random], Any]
+    run: Callable[[Any], Any]
+    number: int = 1000
+    mutates: bool = False
+
+
+def cheese_board(ruleset: "Ruleset", rng: random.Random, num_lines: int) -> Board:
+    """Returns a board with `num_lines` garbage lines with random holes."""
+    board = Board(ruleset.num_cols, ruleset.num_rows)
+    board.insert_below_many(CheeseGenerator(ruleset.num_cols, rng).generate(num_lines))
+    return board
+
+
+def _collision_setup(
+    fixtures: Fixtures, rng: random.Random
+) -> tuple[Board, list[list[Vector2D]]]:
+    ruleset = fixtures.ruleset
+    board = cheese_board(ruleset, rng, ruleset.num_visible_rows // 2)
+    targets = []
+    for _ in range(64):
+        mino = rng.choice(ruleset.mino_types)
+        coords = ruleset.get_coords(mino, rng.randrange(ruleset.num_rots))
+        dx, dy = rng.randrange(ruleset.num_cols), rng.randrange(ruleset.num_rows)
+        targets.append([Vector2D(c.x + dx, c.y + dy) for c in coords])
+    return board, targets
+
+
+def _collision_run(state: tuple[Board, list[list[Vector2D]]]) -> None:
+    board, targets = state
+    for coords in targets:
+        board.has_collision(coords)
+
+
+def _sift_setup(num_lines: int) -> Callable[[Fixtures, random.Random], Board]:
+    def setup(fixtures: Fixtures, rng: random.Random) -> Board:
+        ruleset = fixtures.ruleset
+        board = cheese_board(ruleset, rng, ruleset.num_rows)
+        for y in rng.sample(range(ruleset.num_visible_rows), num_lines):
+            for x in range(ruleset.num_cols):
+                if board[Vector2D(x, y)] == Mino.EMPTY:
+                    board[Vector2D(x, y)] = Mino.GARBAGE
+        return board
+
+    return setup
+
+
+def _rotate_setup(fixtures: Fixtures, rng: random.Random) -> tuple[Board, list[Piece]]:
+    """Buries every piece in a filled board, so that no kick fits and each
+    rotation tries every entry of the kick table.
+    """
+    ruleset = fixtures.ruleset
+    board = cheese_board(ruleset, rng, ruleset.num_rows)
+    for y in range(ruleset.num_rows):
+        for x in range(ruleset.num_cols):
+            board[Vector2D(x, y)] = Mino.GARBAGE
+    return board, [Piece(ruleset, mino) for mino in ruleset.mino_types]
+
+
+def _rotate_run(state: tuple[Board, list[Piece]]) -> None:
+    board, pieces = state
+    for piece in pieces:
+        piece.try_rotate(1, board)
+        piece.try_rotate(-1, board)
+
+
+def _restore_setup(
+    fixtures: Fixtures, rng: random.Random
+) -> tuple[Stacker, list[Snapshot]]:
+    """Snapshots a stacker before and after one piece, so that restoring the two
+    in turn changes the board every time.
+    """
+    stacker = Stacker(fixtures.ruleset, rng)
+    before = stacker.snapshot()
+    stacker.hard_drop()
+    return stacker, [stacker.snapshot(), before]
+
+
+def _restore_run(state: tuple[Stacker, list[Snapshot]]) -> None:
+    stacker, snapshots = state
+    snapshots.reverse()
+    stacker.restore(snapshots[0])
+
+
+def _randomizer_setup(name: str, fixtures: Fixtures, rng: random.Random) -> Randomizer:
+    return RANDOMIZERS[name](fixtures.ruleset.mino_types, rng)
+
+
+def _view_setup(fixtures: Fixtures, rng: random.Random) -> tuple[View, Board]:
+    ruleset = fixtures.ruleset
+    view = View(
+        ruleset.num_cols,
+        ruleset.num_visible_rows,
+        ruleset.num_previews,
+        fixtures.controls,
+        fixtures.font,
+    )
+    return view, cheese_board(ruleset, rng, ruleset.num_visible_rows)
+
+
+def _cells_setup(
+    fixtures: Fixtures, rng: random.Random
+) -> tuple[Cells, Surface, SpriteAtlas]:
+    ruleset = fixtures.ruleset
+    geometry = Geometry(
+        DEFAULT_SIZE, ruleset.num_cols, ruleset.num_visible_rows, ruleset.num_previews
+    )
+    atlas = SpriteAtlas(View.colors)
+    atlas.set_cell_size(geometry.cell_size)
+    cells = Cells(ruleset.num_visible_rows)
+    for line in cheese_board(ruleset, rng, ruleset.num_visible_rows):
+        cells.append(line, geometry.main_grid)
+    return cells, Surface(DEFAULT_SIZE), atlas
+
+
+CASES = [
+    Case("board.has_collision", _collision_setup, _collision_run, number=200),
+    *(
+        Case(f"board.sift_{n}", _sift_setup(n), Board.sift, mutates=True)
+        for n in range(1, 5)
+    ),
+    Case(
+        "board.cheese_100",
+        lambda fixtures, rng: (
+            Board(fixtures.ruleset.num_cols, fixtures.ruleset.num_rows),
+            CheeseGenerator(fixtures.ruleset.num_cols, rng, 0.3, 2),
+        ),
+        lambda state: state[0].insert_below_many(state[1].generate(100)),
+        number=200,
+    ),
+    Case("piece.try_rotate", _rotate_setup, _rotate_run, number=200),
+    Case(
+        "stacker.hard_drop",
+        lambda fixtures, rng: Stacker(fixtures.ruleset, rng),
+        Stacker.hard_drop,
+        mutates=True,
+    ),
+    Case(
+        "stacker.ghost",
+        lambda fixtures, rng: Stacker(fixtures.ruleset, rng),
+        lambda stacker: stacker.ghost,
+    ),
+    Case(
+        "ai.beam_search",
+        lambda fixtures, rng: (
+            BeamSearch(fixtures.ruleset, width=4, budget_ms=None),
+            SearchState.from_stacker(Stacker(fixtures.ruleset, rng)),
+        ),
+        lambda state: state[0].search(state[1]),
+        number=5,
+        mutates=True,
+    ),
+    Case(
+        "stacker.snapshot",
+        lambda fixtures, rng: Stacker(fixtures.ruleset, rng),
+        Stacker.snapshot,
+    ),
+    Case("stacker.restore", _restore_setup, _restore_run),
+    Case(
+        "bag.next",
+        lambda fixtures, rng: Bag(fixtures.ruleset, rng),
+        lambda bag: bag.next,
+        number=10000,
+    ),
+    *(
+        Case(
+            f"randomizer.{name}",
+            partial(_randomizer_setup, name),
+            lambda randomizer: randomizer.generate(1000),
+            number=100,
+        )
+        for name in RANDOMIZERS
+    ),
+    Case(
+        "view.set_board",
+        _view_setup,
+        lambda state: state[0].set_board(state[1]),
+        number=200,
+    ),
+    Case(
+        "cells.paint",
+        _cells_setup,
+        lambda state: state[0].paint(state[1], state[2], View.styles),
+        number=200,
+    ),
+]
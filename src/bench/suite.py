@@ -0,0 +1,112 @@
+"""Runs the benchmark cases and compares results against a baseline."""
+
+import json
+import platform
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from bench.cases import Case, Fixtures
+
+
+@dataclass(frozen=True)
+class Result:
+    """Timings of one case, in nanoseconds per call."""
+
+    name: str
+    number: int
+    best_ns: float
+    median_ns: float
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """A result next to the same case in the baseline."""
+
+    result: Result
+    baseline: Result | None
+    threshold: float
+
+    @property
+    def ratio(self) -> float | None:
+        """Current median over baseline median."""
+        if self.baseline is None or not self.baseline.median_ns:
+            return None
+        return self.result.median_ns / self.baseline.median_ns
+
+    @property
+    def is_regression(self) -> bool:
+        """Flag to indicate if the case got slower by more than `threshold`."""
+        return self.ratio is not None and self.ratio > 1 + self.threshold
+
+    def __str__(self) -> str:
+        ratio = "-" if self.ratio is None else f"{self.ratio:.2f}x"
+        flag = "  REGRESSION" if self.is_regression else ""
+        return (
+            f"{self.result.name:<20} {self.result.median_ns:>12.0f} ns/call"
+            f" {ratio:>7}{flag}"
+        )
+
+
+@dataclass
+class Suite:
+    """Times every case `repeat` times and keeps the best and median samples.
+
+    Each case is given a generator seeded from `seed`, so its state is the same
+    on every run.
+    """
+
+    fixtures: Fixtures
+    seed: int = 0
+    repeat: int = 5
+    scale: float = 1.0
+    results: list[Result] = field(default_factory=lambda: [], init=False)
+
+    def run(self, cases: Iterable[Case]) -> Iterator[Result]:
+        """Runs `cases` one by one, yielding the result of each."""
+        for case in cases:
+            result = self.measure(case)
+            self.results.append(result)
+            yield result
+
+    def measure(self, case: Case) -> Result:
+        """Returns the timings of one case."""
+        number = max(1, round(case.number * self.scale))
+        rng = random.Random(f"{self.seed}:{case.name}")
+        case.run(case.setup(self.fixtures, random.Random(self.seed)))  # warm up
+        samples = []
+        for _ in range(self.repeat):
+            if case.mutates:
+                states = [case.setup(self.fixtures, rng) for _ in range(number)]
+            else:
+                states = [case.setup(self.fixtures, rng)] * number
+            run = case.run
+            start = time.perf_counter_ns()
+            for state in states:
+                run(state)
+            samples.append((time.perf_counter_ns() - start) / number)
+        return Result(case.name, number, min(samples), statistics.median(samples))
+
+    def save(self, path: Path) -> None:
+        """Writes the results as JSON."""
+        data = {
+            "meta": {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "seed": self.seed,
+                "repeat": self.repeat,
+            },
+            "results": [asdict(result) for result in self.results],
+        }
+        with open(path, "w", encoding="utf8") as outfile:
+            json.dump(data, outfile, indent=2)
+
+
+def load_results(path: Path) -> dict[str, Result]:
+    """Reads results written by `Suite.save`, keyed by case name."""
+    with open(path, encoding="utf8") as infile:
+        data = json.load(infile)
+    return {entry["name"]: Result(**entry) for entry in data["results"]}
@@ -0,0 +1,61 @@
+"""Benchmark launch script. Times the engine and renderer hot paths."""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import pygame
+
+from bench.cases import CASES, Fixtures
+from bench.suite import Comparison, Suite, load_results
+from client.controls import Controls
+from common.cli import add_ruleset_arguments
+from common.resource import get_resource_path
+from model.ruleset import Ruleset
+
+
+def parse_args() -> argparse.Namespace:
+    """Parses command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-k", "--filter", default="", help="run matching cases only")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="samples per case")
+    parser.add_argument("--scale", type=float, default=1.0, help="calls per sample")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--compare", type=Path, help="baseline results to compare")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="slowdown flagged as regression"
+    )
+    add_ruleset_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    """Prints one line per case. Exits with status 1 on regressions."""
+    args = parse_args()
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    fixtures = Fixtures(
+        Ruleset.from_config(args.settings, args.ruleset),
+        Controls.from_config(get_resource_path("resource", "controls.yml")),
+        pygame.font.Font(get_resource_path("resource", "FiraCode-Regular.ttf"), 16),
+    )
+    baseline = load_results(args.compare) if args.compare is not None else {}
+
+    suite = Suite(fixtures, args.seed, args.repeat, args.scale)
+    regressions = 0
+    for result in suite.run(case for case in CASES if args.filter in case.name):
+        comparison = Comparison(result, baseline.get(result.name), args.threshold)
+        regressions += comparison.is_regression
+        print(comparison, flush=True)
+
+    if args.output is not None:
+        suite.save(args.output)
+    pygame.quit()
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Cache of pre-rendered cell sprites."""
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import pygame
+from pygame.surface import Surface
+
+from common.enum import CellStyle
+
+if TYPE_CHECKING:
+    from pygame import Color
+
+    from common.enum import Mino
+
+
+@dataclass
+class SpriteAtlas:
+    """Cache of pre-rendered cell sprites, one per mino and style at the current
+    cell size.
+    """
+
+    _colors: "dict[Mino, Color]"
+    _cell_size: int = field(default=0, init=False)
+    _sprites: "dict[tuple[Mino, CellStyle], Surface]" = field(
+        default_factory=lambda: {}, init=False
+    )
+
+    def get(self, mino: "Mino", style: CellStyle) -> Surface:
+        """Returns the sprite of a cell of `mino` painted with `style`."""
+        if (sprite := self._sprites.get((mino, style))) is None:
+            sprite = self._render(self._colors[mino], style)
+            self._sprites[mino, style] = sprite
+        return sprite
+
+    def set_cell_size(self, cell_size: int) -> None:
+        """Discards the cached sprites if the cell size has changed."""
+        if cell_size != self._cell_size:
+            self._cell_size = cell_size
+            self._sprites.clear()
+
+    def _render(self, color: "Color", style: CellStyle) -> Surface:
+        size = (self._cell_size, self._cell_size)
+        if style == CellStyle.ALPHA:
+            sprite = Surface(size)
+            sprite.set_alpha(128)
+            sprite.fill(color)
+            return sprite
+        sprite = Surface(size, pygame.SRCALPHA)
+        pygame.draw.rect(sprite, color, sprite.get_rect(), style)
+        return sprite
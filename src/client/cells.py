@@ -3,17 +3,15 @@
 import sys
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Callable, Iterable
-
-import pygame
-from pygame.surface import Surface
-
-from common.enum import CellStyle
+from typing import TYPE_CHECKING, Iterable
 
 if TYPE_CHECKING:
-    from pygame import Color, Rect
+    from pygame import Rect
+    from pygame.surface import Surface
 
-    from common.enum import Mino
+    from client.atlas import SpriteAtlas
+    from client.geometry import Grid
+    from common.enum import CellStyle, Mino
     from common.vector import Vector2D
 
 
@@ -26,16 +24,20 @@ class Cells:
         default_factory=lambda: defaultdict(list), init=False
     )
 
-    def append(
-        self,
-        cells: "Iterable[tuple[Vector2D, Mino]]",
-        transform: "Callable[[Vector2D], Rect]",
-    ) -> None:
-        """Adds a rect if it's in a visible row."""
+    def append(self, cells: "Iterable[tuple[Vector2D, Mino]]", grid: "Grid") -> None:
+        """Adds the rect of each cell from `grid` if it's in a visible row."""
         for coord, mino in cells:
             if coord.y >= self._max_row:
                 continue
-            self._rects[mino].append(transform(coord))
+            self._rects[mino].append(grid[coord.y][coord.x])
+
+    @property
+    def bounds(self) -> "Rect | None":
+        """The smallest rect containing all stored rects."""
+        rects = [rect for mino_rects in self._rects.values() for rect in mino_rects]
+        if not rects:
+            return None
+        return rects[0].unionall(rects[1:])
 
     def clear(self) -> None:
         """Clears stored rects."""
@@ -45,20 +47,15 @@ class Cells:
     def paint(
         self,
         canvas: "Surface",
-        colors: "dict[Mino, Color]",
+        atlas: "SpriteAtlas",
         styles: "CellStyle | dict[Mino, CellStyle]",
     ) -> None:
-        """Paints the canvas with at the specified rects with the specified
-        colors and styles.
+        """Paints the canvas at the specified rects with the cached sprites of
+        the specified styles, in a single batched blit.
         """
+        blits: "list[tuple[Surface, Rect]]" = []
         for mino, rects in self._rects.items():
-            color = colors[mino]
             style = styles[mino] if isinstance(styles, dict) else styles
-            for rect in rects:
-                if styles == CellStyle.ALPHA:
-                    surface = Surface(rect.size)
-                    surface.set_alpha(128)
-                    surface.fill(color)
-                    canvas.blit(surface, rect)
-                else:
-                    pygame.draw.rect(canvas, color, rect, style)
+            sprite = atlas.get(mino, style)
+            blits.extend((sprite, rect) for rect in rects)
+        canvas.blits(blits, doreturn=False)
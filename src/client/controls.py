@@ -1,12 +1,12 @@
 """Keystroke to game op bindings."""
 
 from dataclasses import InitVar, dataclass, field
-from datetime import timedelta
 from pathlib import Path
 
 import pygame
 import yaml
 
+from common.config_cache import cache_path, load_cached
 from common.enum import Action
 
 
@@ -17,8 +17,8 @@ class Controls:
     keybinding: InitVar[dict[str, str]]
     handling: InitVar[dict[str, int]]
 
-    das: timedelta = field(init=False)
-    arr: timedelta = field(init=False)
+    das: int = field(init=False)
+    arr: int = field(init=False)
     _action_to_key: dict[Action, int] = field(default_factory=lambda: {}, init=False)
     _key_to_action: dict[int, Action] = field(default_factory=lambda: {}, init=False)
 
@@ -31,8 +31,8 @@ class Controls:
             self._action_to_key[Action[action]] = key
             self._key_to_action[key] = Action[action]
 
-        self.das = timedelta(milliseconds=handling["das"])
-        self.arr = timedelta(milliseconds=handling["arr"])
+        self.das = handling["das"] * 1_000_000
+        self.arr = handling["arr"] * 1_000_000
 
     def get_key_name(self, action: Action) -> str:
         """Returns the key name for the specified action."""
@@ -44,7 +44,19 @@ class Controls:
 
     @classmethod
     def from_config(cls, config_path: Path) -> "Controls":
-        """Constructs Controls from config file."""
+        """Constructs Controls from config file. The parsed controls are cached
+        next to the config file until it or this module changes.
+        """
+        return load_cached(
+            cache_path(config_path),
+            [config_path],
+            lambda: cls.parse_config(config_path),
+            [cls],
+        )
+
+    @classmethod
+    def parse_config(cls, config_path: Path) -> "Controls":
+        """Constructs Controls from config file, without the cache."""
         with open(config_path, encoding="utf8") as infile:
             cfg = yaml.safe_load(infile.read())
         return cls(**cfg)
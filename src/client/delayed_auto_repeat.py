@@ -1,48 +1,78 @@
 """Class which repeats loaded action after a delay."""
 
+import sys
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from datetime import timedelta
-
     from common.enum import Action
 
+# Repeat count of a zero period: as many times as the action can be applied.
+INSTANT = sys.maxsize
+
+
+@dataclass(frozen=True)
+class Repeat:
+    """A batch of repeats of `action` which have become due, the first of them
+    at `scheduled`.
+    """
+
+    action: "Action"
+    count: int
+    scheduled: int
+
 
 @dataclass
 class DelayedAutoRepeat:
-    """Class which repeats loaded action after a delay."""
+    """Class which repeats loaded action after a delay. Times are integer
+    nanoseconds.
+
+    With a zero period the action is repeated `INSTANT` times on every trigger
+    once the delay has passed, for as long as it stays loaded.
+    """
 
-    _delay: "timedelta"
-    _period: "timedelta"
+    _delay: int
+    _period: int
     _load: "Action | None" = field(default=None, init=False)
-    _trigger_time: "timedelta | None" = field(default=None, init=False)
+    _trigger_time: int = field(default=0, init=False)
+    _charged: bool = field(default=False, init=False)
+
+    @property
+    def next_trigger(self) -> int | None:
+        """The time at which the loaded action is next triggered, if it has
+        to be waited for.
+        """
+        return None if self._load is None or self._charged else self._trigger_time
 
-    def start(self, now: "timedelta", action: "Action") -> bool:
+    def start(self, now: int, action: "Action") -> bool:
         """Loads a different action to be repeated."""
         if self._is_loaded(action):
             return False
         self._load = action
         self._trigger_time = now + self._delay
+        self._charged = False
         return True
 
     def stop(self, action: "Action") -> None:
         """Removes currently loaded action."""
         if self._is_loaded(action):
             self._load = None
-            self._trigger_time = None
+            self._charged = False
 
-    def trigger(self, now: "timedelta") -> "Action | None":
+    def trigger(self, now: int) -> Repeat | None:
         """Triggers loaded action if available and if sufficient time has
-        passed.
+        passed, once for every period which has elapsed since the last trigger.
         """
-        if self._load is None or (
-            self._trigger_time is not None and self._trigger_time > now
-        ):
+        if self._load is None or self._trigger_time > now:
             return None
-        assert self._trigger_time is not None
-        self._trigger_time += self._period
-        return self._load
+        scheduled = self._trigger_time
+        if self._period == 0:
+            self._charged = True
+            self._trigger_time = now
+            return Repeat(self._load, INSTANT, scheduled)
+        count = (now - scheduled) // self._period + 1
+        self._trigger_time += count * self._period
+        return Repeat(self._load, count, scheduled)
 
     def _is_loaded(self, action: "Action") -> bool:
         """Indicates if an action has been loaded."""
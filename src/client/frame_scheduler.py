@@ -0,0 +1,57 @@
+"""Paces the main loop."""
+
+from dataclasses import InitVar, dataclass, field
+from typing import TYPE_CHECKING
+
+import pygame
+
+if TYPE_CHECKING:
+    from pygame.event import Event
+
+
+@dataclass
+class FrameScheduler:
+    """Paces the main loop. Frames are painted at most `fps` times per second,
+    or once per display refresh with `vsync`, and the loop sleeps while there is
+    nothing to do. Times are integer nanoseconds.
+    """
+
+    fps: InitVar[int]
+    vsync: bool = False
+    _period: int = field(init=False)
+    _next_frame: int = field(default=0, init=False)
+
+    def __post_init__(self, fps: int) -> None:
+        self._period = 1_000_000_000 // fps
+
+    def is_frame_due(self, now: int) -> bool:
+        """Flag to indicate if a frame may be painted."""
+        return self.vsync or now >= self._next_frame
+
+    def mark_frame(self, now: int) -> None:
+        """Records that a frame has been painted."""
+        self._next_frame = now + self._period
+
+    def wait(
+        self, now: int, deadline: int | None, pending_paint: bool
+    ) -> "Event | None":
+        """Sleeps until the next input event, the next autorepeat `deadline` or,
+        when there are changes waiting to be painted, the next frame.
+
+        Returns:
+            The input event which ended the wait, if any. It has been removed
+            from the event queue and must be handled by the caller.
+        """
+        if pending_paint:
+            if self.vsync:
+                return None
+            if deadline is None or self._next_frame < deadline:
+                deadline = self._next_frame
+        if deadline is None:
+            event = pygame.event.wait()
+        else:
+            timeout = -((now - deadline) // 1_000_000)
+            if timeout <= 0:
+                return None
+            event = pygame.event.wait(timeout)
+        return None if event.type == pygame.NOEVENT else event
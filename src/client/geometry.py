@@ -3,25 +3,34 @@ representation.
 """
 
 from dataclasses import InitVar, dataclass, field
-from typing import TYPE_CHECKING, Callable
 
 from pygame import Rect
 
-if TYPE_CHECKING:
-    from common.vector import Vector2D
+# Side length, in cells, of the hold and preview slots.
+SLOT_SIZE = 4
+
+Grid = tuple[tuple[Rect, ...], ...]
 
 
 @dataclass
-class Geometry:
+class Geometry:  # pylint: disable=too-many-instance-attributes
     """Class to converts coordinates from internal representation to rendered
     representation.
+
+    The rects of every board cell and of every hold and preview slot cell are
+    computed once per window size, as grids indexed by [y][x]. The rects are
+    shared and must not be modified.
     """
 
     size: InitVar[tuple[int, int]]
     _num_cols: int
     _num_rows: int
+    _num_previews: int
 
     _board_area: Rect = field(init=False)
+    _main_grid: Grid = field(init=False)
+    _hold_grid: Grid = field(init=False)
+    _preview_grids: tuple[Grid, ...] = field(init=False)
 
     _cell_size: int = field(init=False)
     _line_height: int = field(default=19, init=False)
@@ -29,13 +38,22 @@ class Geometry:
     _text_pad: int = field(default=6, init=False)
 
     def __post_init__(self, size: tuple[int, int]) -> None:
-        self._cell_size = int(size[1] * 3 / 4 / self._num_rows)
+        self.resize(size)
 
-        main_w = self._cell_size * self._num_cols
-        main_h = self._cell_size * self._num_rows
-        main_x = int((size[0] - main_w) / 2)
-        main_y = int((size[1] - main_h) / 2 - self._line_height_small)
-        self._board_area = Rect(main_x, main_y, main_w, main_h)
+    @property
+    def cell_size(self) -> int:
+        """The side length of a cell."""
+        return self._cell_size
+
+    @property
+    def hold_grid(self) -> Grid:
+        """The rects of the 'hold' cells."""
+        return self._hold_grid
+
+    @property
+    def main_grid(self) -> Grid:
+        """The rects of the 'main' cells."""
+        return self._main_grid
 
     def get_hud_loc(self, group: int, line: int) -> tuple[int, int]:
         """Creates the top-left position for HUD group."""
@@ -44,29 +62,45 @@ class Geometry:
         y += group * self._line_height
         return self._text_pad, y
 
-    def transform(self, category: str) -> Callable:
-        """Returns the coordinates transform function for the specified
-        category.
-        """
-        return getattr(self, f"_map_{category}_coords")
+    def preview_grid(self, idx: int) -> Grid:
+        """The rects of the 'preview' cells at position `idx` of the queue."""
+        return self._preview_grids[idx]
 
-    def _map_hold_coords(self, coord: "Vector2D") -> Rect:
-        """Creates the geometry for the 'hold' cell."""
-        x_0 = self._board_area.left - self._cell_size * 5
-        y_0 = self._board_area.top + self._cell_size * 3
-        return self._make_cell(x_0, y_0, self._cell_size, coord)
-
-    def _map_main_coords(self, coord: "Vector2D") -> Rect:
-        """Creates the geometry for the 'main' cells."""
-        x_0, y_0 = self._board_area.bottomleft
-        return self._make_cell(x_0, y_0, self._cell_size, coord)
+    def resize(self, size: tuple[int, int]) -> None:
+        """Lays out the board for a window of `size` and rebuilds the grids."""
+        self._cell_size = int(size[1] * 3 / 4 / self._num_rows)
 
-    def _map_preview_coords(self, idx: int, coord: "Vector2D") -> Rect:
-        """Creates the geometry for the 'preview' cells."""
-        x_0 = self._board_area.right + self._cell_size
-        y_0 = self._board_area.top + self._cell_size * (idx + 1) * 3
-        return self._make_cell(x_0, y_0, self._cell_size, coord)
+        main_w = self._cell_size * self._num_cols
+        main_h = self._cell_size * self._num_rows
+        main_x = int((size[0] - main_w) / 2)
+        main_y = int((size[1] - main_h) / 2 - self._line_height_small)
+        self._board_area = Rect(main_x, main_y, main_w, main_h)
 
-    @staticmethod
-    def _make_cell(x_0: int, y_0: int, size: int, coord: "Vector2D") -> Rect:
-        return Rect(x_0 + size * coord.x, y_0 - size * (coord.y - 1), size, size)
+        x_0, y_0 = self._board_area.bottomleft
+        self._main_grid = self._make_grid(x_0, y_0, self._num_cols, self._num_rows)
+        self._hold_grid = self._make_grid(
+            self._board_area.left - self._cell_size * 5,
+            self._board_area.top + self._cell_size * 3,
+            SLOT_SIZE,
+            SLOT_SIZE,
+        )
+        self._preview_grids = tuple(
+            self._make_grid(
+                self._board_area.right + self._cell_size,
+                self._board_area.top + self._cell_size * (idx + 1) * 3,
+                SLOT_SIZE,
+                SLOT_SIZE,
+            )
+            for idx in range(self._num_previews)
+        )
+
+    def _make_grid(self, x_0: int, y_0: int, num_cols: int, num_rows: int) -> Grid:
+        """Creates the rects of a grid of cells anchored at (`x_0`, `y_0`)."""
+        size = self._cell_size
+        return tuple(
+            tuple(
+                Rect(x_0 + size * x, y_0 - size * (y - 1), size, size)
+                for x in range(num_cols)
+            )
+            for y in range(num_rows)
+        )
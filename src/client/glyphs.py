@@ -0,0 +1,45 @@
+"""Cache of pre-rendered text glyphs."""
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from pygame import Rect
+
+if TYPE_CHECKING:
+    from pygame.font import Font
+    from pygame.surface import Surface
+
+
+@dataclass
+class GlyphCache:
+    """Cache of pre-rendered glyphs, so that frequently changing text such as
+    numbers is composed from cached surfaces instead of being rendered again.
+    """
+
+    _font: "Font"
+    _glyphs: "dict[str, tuple[Surface, int]]" = field(
+        default_factory=lambda: {}, init=False
+    )
+
+    def paint(self, canvas: "Surface", text: str, top_left: tuple[int, int]) -> Rect:
+        """Paints `text` onto canvas, one cached glyph per character.
+
+        Returns:
+            The area covered by the text.
+        """
+        x, y = top_left
+        blits = []
+        for char in text:
+            surface, advance = self._get(char)
+            if not char.isspace():
+                blits.append((surface, (x, y)))
+            x += advance
+        canvas.blits(blits, doreturn=False)
+        return Rect(top_left, (x - top_left[0], self._font.get_linesize()))
+
+    def _get(self, char: str) -> "tuple[Surface, int]":
+        if (glyph := self._glyphs.get(char)) is None:
+            surface = self._font.render(char, True, (255, 255, 255))
+            glyph = surface, self._font.size(char)[0]
+            self._glyphs[char] = glyph
+        return glyph
@@ -0,0 +1,76 @@
+"""Receive to display latency of game actions."""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from client.metrics import Histogram
+from common.enum import Action
+
+if TYPE_CHECKING:
+    from pygame.event import Event
+
+
+@dataclass
+class LatencyTracker:
+    """Measures the time from each input to the display update showing it.
+
+    Key presses are timed from their `received_ns` stamp, the time `Timer`
+    took them off the SDL queue, which includes any wait in the queue during a
+    paint or a display update. Time spent in the OS and in SDL before that is
+    not seen, so the figures are a lower bound of the input latency.
+    Autorepeated actions are stamped with the time they were scheduled for,
+    and the delay of the repeat itself is recorded as drift.
+    """
+
+    histograms: dict[Action, Histogram] = field(
+        default_factory=lambda: {action: Histogram() for action in Action}
+    )
+    drift: Histogram = field(default_factory=Histogram)
+    _pending: list[tuple[Action, int]] = field(default_factory=lambda: [], init=False)
+
+    def input(self, action: Action, event: "Event") -> None:
+        """Starts timing `action`, triggered by `event`."""
+        if (received := getattr(event, "received_ns", None)) is not None:
+            self._pending.append((action, received))
+
+    def repeat(self, action: Action, scheduled: int, now: int) -> None:
+        """Starts timing `action`, autorepeated at `now` for `scheduled`."""
+        self.drift.record(now - scheduled)
+        self._pending.append((action, scheduled))
+
+    def present(self, now: int) -> None:
+        """Records the latency of every action shown by the display update."""
+        for action, start in self._pending:
+            self.histograms[action].record(now - start)
+        self._pending.clear()
+
+    def overlay(self) -> list[str]:
+        """Returns one line of p50/p99 latencies per action, in milliseconds."""
+        width = max(len(action.name) for action in Action)
+        lines = [f"{'Received to shown':<{width}} p50/p99 ms"]
+        for action, histogram in self.histograms.items():
+            if histogram.count:
+                lines.append(f"{action.name:<{width}} {_p50_p99(histogram)}")
+        lines.append(f"{'DAS drift':<{width}} {_p50_p99(self.drift)}")
+        return lines
+
+    def dump(self, path: Path) -> None:
+        """Writes the latency of every action and the drift as JSON."""
+        summary = {
+            "latency": {
+                action.name: histogram.summary()
+                for action, histogram in self.histograms.items()
+                if histogram.count
+            },
+            "das_drift": self.drift.summary(),
+        }
+        with open(path, "w", encoding="utf8") as outfile:
+            json.dump(summary, outfile, indent=2)
+
+
+def _p50_p99(histogram: Histogram) -> str:
+    return (
+        f"{histogram.percentile(50) / 1e6:.1f}/{histogram.percentile(99) / 1e6:.1f}"
+    )
@@ -0,0 +1,153 @@
+"""Timing histograms for the phases of the main loop."""
+
+import csv
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Callable, TypeVar
+
+from common.enum import Phase
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Each power of two is split into 2^SUB_BITS buckets, so a bucket spans at most
+# a quarter of its lower bound.
+SUB_BITS = 2
+NUM_BUCKETS = 64 << SUB_BITS
+
+
+def bucket_of(value: int) -> int:
+    """Returns the index of the histogram bucket holding `value`."""
+    if value < 2 << SUB_BITS:
+        return max(value, 0)
+    exp = value.bit_length() - SUB_BITS - 1
+    return (exp << SUB_BITS) + (value >> exp)
+
+
+def bucket_floor(idx: int) -> int:
+    """Returns the smallest value held by the bucket at `idx`."""
+    if idx < 2 << SUB_BITS:
+        return idx
+    exp = (idx >> SUB_BITS) - 1
+    return ((idx & ((1 << SUB_BITS) - 1)) + (1 << SUB_BITS)) << exp
+
+
+@dataclass
+class Histogram:
+    """Histogram of durations in nanoseconds, with fixed logarithmic buckets.
+
+    Recording is a few integer operations and never allocates, so it is cheap
+    enough to run on every frame.
+    """
+
+    counts: list[int] = field(default_factory=lambda: [0] * NUM_BUCKETS)
+    count: int = 0
+    total: int = 0
+    max: int = 0
+
+    def record(self, value: int) -> None:
+        """Adds one duration."""
+        self.counts[bucket_of(value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        """The mean of all recorded durations."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> int:
+        """Returns an upper bound of the `pct` percentile, accurate to the
+        width of one bucket.
+        """
+        if not self.count:
+            return 0
+        rank = pct / 100 * self.count
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(bucket_floor(idx + 1) - 1, self.max)
+        return self.max
+
+    def summary(self) -> dict[str, Any]:
+        """Returns the statistics and the non-empty buckets."""
+        return {
+            "count": self.count,
+            "mean_ns": round(self.mean),
+            "p50_ns": self.percentile(50),
+            "p99_ns": self.percentile(99),
+            "max_ns": self.max,
+            "buckets": {
+                bucket_floor(idx): count
+                for idx, count in enumerate(self.counts)
+                if count
+            },
+        }
+
+
+@dataclass
+class FrameMetrics:
+    """Times the phases of the main loop into one histogram per phase.
+
+    Phases are timed by wrapping the callables which implement them with
+    `timed` or `instrument`. When the metrics are disabled nothing is wrapped,
+    so the main loop runs without any overhead.
+    """
+
+    enabled: bool = True
+    histograms: dict[Phase, Histogram] = field(
+        default_factory=lambda: {phase: Histogram() for phase in Phase}
+    )
+
+    def timed(self, phase: Phase, func: F) -> F:
+        """Returns `func`, timed into the histogram of `phase` when enabled."""
+        if not self.enabled:
+            return func
+        histogram = self.histograms[phase]
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.record(perf_counter_ns() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    def instrument(self, obj: object, name: str, phase: Phase) -> None:
+        """Replaces the method `name` of `obj` with a timed version."""
+        if self.enabled:
+            setattr(obj, name, self.timed(phase, getattr(obj, name)))
+
+    def overlay(self) -> list[str]:
+        """Returns one line of p50/p99 timings per phase, in microseconds."""
+        width = max(len(phase.value) for phase in Phase)
+        lines = [f"{'Phase':<{width}} p50/p99 us"]
+        for phase, histogram in self.histograms.items():
+            lines.append(
+                f"{phase.value:<{width}} "
+                f"{histogram.percentile(50) / 1000:.0f}/"
+                f"{histogram.percentile(99) / 1000:.0f}"
+            )
+        return lines
+
+    def dump(self, path: Path) -> None:
+        """Writes the statistics of every phase to `path`, as CSV if its
+        suffix is `.csv` and as JSON otherwise.
+        """
+        summaries = {
+            phase.value: histogram.summary()
+            for phase, histogram in self.histograms.items()
+        }
+        with open(path, "w", encoding="utf8", newline="") as outfile:
+            if path.suffix != ".csv":
+                json.dump(summaries, outfile, indent=2)
+                return
+            fields = ["phase", "count", "mean_ns", "p50_ns", "p99_ns", "max_ns"]
+            writer = csv.DictWriter(outfile, fields, extrasaction="ignore")
+            writer.writeheader()
+            for phase, summary in summaries.items():
+                writer.writerow({"phase": phase, **summary})
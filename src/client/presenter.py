@@ -1,65 +1,148 @@
 """Presenter class."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
-from common.enum import Action, Update
+from common.enum import Action, Phase, Update
 
 if TYPE_CHECKING:
+    from pygame import Rect
     from pygame.event import Event
     from pygame.surface import Surface
 
+    from client.latency import LatencyTracker
+    from client.metrics import FrameMetrics
+    from client.stats import SessionStats
     from client.timer import Timer
     from client.view import View
+    from common.replay import ReplayRecorder
+    from model.finesse import FinesseTable
     from model.stacker import Stacker
 
 
 @dataclass
-class Presenter:
+class Presenter:  # pylint: disable=too-many-instance-attributes
     """Presenter class."""
 
     stacker: "Stacker"
     view: "View"
+    recorder: "ReplayRecorder | None" = None
+    metrics: "FrameMetrics | None" = None
+    latency: "LatencyTracker | None" = None
+    stats: "SessionStats | None" = None
+    finesse: "FinesseTable | None" = None
+    _presses: int = field(default=0, init=False)
+    _soft_dropped: bool = field(default=False, init=False)
 
     def __post_init__(self) -> None:
+        if self.metrics is not None:
+            self.metrics.instrument(self, "handle_action", Phase.ACTION)
+            self.metrics.instrument(self, "handle_repeat", Phase.ACTION)
+            self.metrics.instrument(self, "_update_view", Phase.UPDATE_VIEW)
+            self.metrics.instrument(self.view, "paint", Phase.PAINT)
         self._update_view(Update.all())
 
+    @property
+    def has_changes(self) -> bool:
+        """Flag to indicate if the view needs to be painted."""
+        return self.view.has_changes
+
     def handle(self, event: "Event", timer: "Timer") -> None:
         """Handles input event."""
         if (action := self.view.handle(event, timer)) is not None:
+            if self.latency is not None:
+                self.latency.input(action, event)
             self.handle_action(action)
+        elif self.view.needs_refresh:
+            self._update_view(Update.all())
 
     def handle_action(self, action: Action) -> None:
         """Handles game operations."""
+        if self.recorder is not None:
+            self.recorder.record(action)
         instruction: Update | list[Update] | None = None
         match action:
             case Action.MOVE_LEFT | Action.MOVE_RIGHT:
                 dx = -1 if action == Action.MOVE_LEFT else 1
                 self.stacker.move_horizontal(dx)
+                self._presses += 1
                 instruction = Update.PIECE
             case Action.ROTATE_CCW | Action.ROTATE_CW:
                 dr = 1 if action == Action.ROTATE_CW else -1
                 self.stacker.rotate(dr)
+                self._presses += 1
                 instruction = Update.PIECE
             case Action.SOFT_DROP:
                 self.stacker.soft_drop()
+                self._soft_dropped = True
                 instruction = Update.PIECE
             case Action.HARD_DROP:
+                self._check_finesse()
                 self.stacker.hard_drop()
                 instruction = Update.all()
             case Action.HOLD:
                 self.stacker.hold()
+                self._presses, self._soft_dropped = 0, False
                 instruction = [Update.PIECE, Update.QUEUE]
             case Action.RESET:
                 self.stacker.reset()
+                self._presses, self._soft_dropped = 0, False
+                instruction = Update.all()
+            case Action.UNDO:
+                self.stacker.undo()
+                self._presses, self._soft_dropped = 0, False
+                instruction = Update.all()
+            case Action.REDO:
+                self.stacker.redo()
+                self._presses, self._soft_dropped = 0, False
                 instruction = Update.all()
 
+        if self.stats is not None:
+            if action in (Action.UNDO, Action.REDO):
+                self.stats.rewind(self.stacker.garbage_cleared)
+            else:
+                self.stats.record(action, self.stacker.garbage_cleared)
         self._update_view(instruction)
 
-    def paint(self, canvas: "Surface") -> None:
-        """Renders view."""
+    def handle_repeat(self, action: Action, count: int) -> int:
+        """Handles `count` autorepeats of a horizontal move as one operation,
+        recording one move per cell moved.
+
+        Returns:
+            The number of cells moved.
+        """
+        moved = self.stacker.shift_horizontal(
+            -1 if action == Action.MOVE_LEFT else 1, count
+        )
+        if self.recorder is not None:
+            for _ in range(moved):
+                self.recorder.record(action)
+        if moved:
+            self._update_view(Update.PIECE)
+        return moved
+
+    def paint(self, canvas: "Surface") -> "list[Rect]":
+        """Renders view.
+
+        Returns:
+            The areas of the canvas which have changed.
+        """
         self.view.render_labels()
-        self.view.paint(canvas)
+        return self.view.paint(canvas)
+
+    def _check_finesse(self) -> None:
+        """Compares the key presses spent on the current piece, which is about
+        to lock, with the fewest possible on an empty field. Pieces which were
+        soft dropped are not judged.
+        """
+        presses, soft_dropped = self._presses + 1, self._soft_dropped
+        self._presses, self._soft_dropped = 0, False
+        if self.finesse is None or soft_dropped:
+            return
+        ghost = self.stacker.ghost
+        if self.finesse.is_fault(ghost.mino, ghost.coords, presses):
+            if self.stats is not None:
+                self.stats.faults += 1
 
     def _update_view(self, instruction: Update | list[Update] | None) -> None:
         if instruction is None:
@@ -0,0 +1,96 @@
+"""Live session statistics."""
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from common.enum import Action
+
+# Rolling window, in nanoseconds, of the piece and key rates.
+PIECE_WINDOW = 10_000_000_000
+# Rolling window, in nanoseconds, of the garbage rate.
+GARBAGE_WINDOW = 60_000_000_000
+
+
+@dataclass
+class RollingSum:
+    """Sum of the amounts added within the last `window` nanoseconds."""
+
+    window: int
+    total: int = field(default=0, init=False)
+    _events: "deque[tuple[int, int]]" = field(default_factory=deque, init=False)
+
+    def add(self, now: int, amount: int = 1) -> None:
+        """Adds `amount` at time `now`."""
+        self._events.append((now, amount))
+        self.total += amount
+
+    def value(self, now: int) -> int:
+        """Returns the sum over the window ending at `now`."""
+        while self._events and self._events[0][0] <= now - self.window:
+            self.total -= self._events.popleft()[1]
+        return self.total
+
+
+@dataclass
+class SessionStats:
+    """Pieces per second, keys per piece, garbage cleared per minute, time
+    elapsed since the start of the session and finesse faults, updated with
+    every action apart from undo and redo.
+    """
+
+    start: int = field(default_factory=time.perf_counter_ns)
+    _keys: RollingSum = field(init=False)
+    _pieces: RollingSum = field(init=False)
+    _garbage: RollingSum = field(init=False)
+    _garbage_cleared: int = field(default=0, init=False)
+    faults: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self.reset(self.start)
+
+    def record(self, action: Action, garbage_cleared: int) -> None:
+        """Counts `action`. `garbage_cleared` is the total of the stacker."""
+        now = time.perf_counter_ns()
+        if action == Action.RESET:
+            self.reset(now)
+            return
+        self._keys.add(now)
+        if action == Action.HARD_DROP:
+            self._pieces.add(now)
+            self._garbage.add(now, garbage_cleared - self._garbage_cleared)
+            self._garbage_cleared = garbage_cleared
+
+    def rewind(self, garbage_cleared: int) -> None:
+        """Follows the stacker to another point of its history, where it has
+        cleared `garbage_cleared` garbage rows. Pieces, keys and faults counted
+        so far stay counted, as they were played, and only the garbage cleared
+        from that point on is added.
+        """
+        self._garbage_cleared = garbage_cleared
+
+    def reset(self, now: int) -> None:
+        """Starts a new session at `now`."""
+        self.start = now
+        self._keys = RollingSum(PIECE_WINDOW)
+        self._pieces = RollingSum(PIECE_WINDOW)
+        self._garbage = RollingSum(GARBAGE_WINDOW)
+        self._garbage_cleared = 0
+        self.faults = 0
+
+    def lines(self, now: int) -> list[str]:
+        """Returns the text of the stats panel."""
+        elapsed = now - self.start
+        pieces = self._pieces.value(now)
+        pps = pieces * 1e9 / max(min(elapsed, PIECE_WINDOW), 1)
+        kpp = self._keys.value(now) / pieces if pieces else 0.0
+        gpm = self._garbage.value(now) * 60e9 / max(min(elapsed, GARBAGE_WINDOW), 1)
+        minutes, tenths = divmod(elapsed // 100_000_000, 600)
+        return [
+            "Stats:",
+            f"{'PPS':<12}: {pps:6.2f}",
+            f"{'KPP':<12}: {kpp:6.2f}",
+            f"{'Garbage/min':<12}: {gpm:6.1f}",
+            f"{'Time':<12}: {minutes:02}:{tenths // 10:02}.{tenths % 10}",
+            f"{'Faults':<12}: {self.faults:6}",
+        ]
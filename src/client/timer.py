@@ -2,45 +2,86 @@
 
 import time
 from dataclasses import InitVar, dataclass, field
-from datetime import timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
+
+import pygame
 
 from client.delayed_auto_repeat import DelayedAutoRepeat
 
 if TYPE_CHECKING:
+    from pygame.event import Event
+
+    from client.delayed_auto_repeat import Repeat
     from common.enum import Action
 
 
 @dataclass
 class Timer:
-    """Timer class to handle DAS."""
+    """Timer class to handle DAS. Times are `perf_counter_ns` nanoseconds.
+
+    Events pass through the timer on their way from the SDL queue to the game,
+    and key presses are stamped with the time they were taken off the queue.
+    """
 
-    das: InitVar[timedelta]
-    arr: InitVar[timedelta]
+    das: InitVar[int]
+    arr: InitVar[int]
 
-    latest: timedelta = field(init=False)
+    latest: int = field(init=False)
     _autorepeat: DelayedAutoRepeat = field(init=False)
+    _received: "list[Event]" = field(default_factory=list, init=False)
 
-    def __post_init__(self, das: timedelta, arr: timedelta) -> None:
-        self.latest = self._now()
+    def __post_init__(self, das: int, arr: int) -> None:
+        self.latest = time.perf_counter_ns()
         self._autorepeat = DelayedAutoRepeat(das, arr)
 
-    def start_autorepeat(self, action: "Action") -> bool:
-        """Starts DAS timer."""
-        return self._autorepeat.start(self.latest, action)
+    @property
+    def next_deadline(self) -> int | None:
+        """The time of the next autorepeat, if any."""
+        return self._autorepeat.next_trigger
+
+    @property
+    def has_events(self) -> bool:
+        """Flag to indicate if received events are waiting to be handled."""
+        return bool(self._received)
+
+    def receive(self, events: "Iterable[Event]") -> None:
+        """Queues `events`, which were just taken off the SDL queue, and tags
+        the key presses among them with `received_ns`, the current time.
+        """
+        now = time.perf_counter_ns()
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                event.received_ns = now
+            self._received.append(event)
+
+    def collect(self) -> None:
+        """Takes the waiting events off the SDL queue. Called between the
+        phases of a frame, so that a key pressed during a paint or a display
+        update is stamped when that phase ends rather than when the next frame
+        starts.
+        """
+        self.receive(pygame.event.get())
+
+    def events(self) -> "list[Event]":
+        """Returns the events received since the last call, oldest first."""
+        self.collect()
+        events, self._received = self._received, []
+        return events
+
+    def start_autorepeat(self, action: "Action", pressed: int | None = None) -> bool:
+        """Starts DAS timer, from the time the key was `pressed` if known."""
+        return self._autorepeat.start(
+            self.latest if pressed is None else pressed, action
+        )
 
     def stop_autorepeat(self, action: "Action") -> None:
         """Stops DAS timer."""
         self._autorepeat.stop(action)
 
-    def poll(self) -> "Action | None":
-        """Triggers any loaded actions."""
+    def poll(self) -> "Repeat | None":
+        """Triggers the loaded action, batching every repeat which is due."""
         return self._autorepeat.trigger(self.latest)
 
     def update(self) -> None:
         """Updates internal clock."""
-        self.latest = self._now()
-
-    @staticmethod
-    def _now() -> timedelta:
-        return timedelta(microseconds=time.perf_counter_ns() // 1000)
+        self.latest = time.perf_counter_ns()
@@ -1,21 +1,23 @@
 """Renderer."""
 
 from dataclasses import InitVar, dataclass, field
-from functools import partial
 from typing import TYPE_CHECKING, ClassVar
 
 import pygame
 from pygame import Color
+from pygame.surface import Surface
 
+from client.atlas import SpriteAtlas
 from client.cells import Cells
 from client.geometry import Geometry
+from client.glyphs import GlyphCache
 from client.label import Label
 from common.enum import Action, CellStyle, Mino
 
 if TYPE_CHECKING:
+    from pygame import Rect
     from pygame.event import Event
     from pygame.font import Font
-    from pygame.surface import Surface
 
     from client.controls import Controls
     from client.timer import Timer
@@ -51,18 +53,33 @@ class View:  # pylint: disable=too-many-instance-attributes
 
     num_cols: InitVar[int]
     num_rows: InitVar[int]
+    num_previews: InitVar[int]
 
     _controls: "Controls"
     _font: "Font"
     _geometry: Geometry = field(init=False)
+    _atlas: SpriteAtlas = field(init=False)
+    _glyphs: GlyphCache = field(init=False)
     _queue: Cells = field(init=False)
     _board: Cells = field(init=False)
     _piece: Cells = field(init=False)
     _ghost: Cells = field(init=False)
     _help: list[Label] = field(default_factory=lambda: [], init=False)
+    _overlay: list[Label] = field(default_factory=lambda: [], init=False)
+    _layer: "Surface | None" = field(default=None, init=False)
+    _layer_dirty: bool = field(default=True, init=False)
+    _piece_dirty: bool = field(default=True, init=False)
+    _piece_rects: "list[Rect]" = field(default_factory=lambda: [], init=False)
+    _stats: list[str] = field(default_factory=lambda: [], init=False)
+    _stats_dirty: bool = field(default=False, init=False)
+    _stats_rects: "list[Rect]" = field(default_factory=lambda: [], init=False)
+    needs_refresh: bool = field(default=False, init=False)
 
-    def __post_init__(self, num_cols: int, num_rows: int) -> None:
-        self._geometry = Geometry(DEFAULT_SIZE, num_cols, num_rows)
+    def __post_init__(self, num_cols: int, num_rows: int, num_previews: int) -> None:
+        self._geometry = Geometry(DEFAULT_SIZE, num_cols, num_rows, num_previews)
+        self._atlas = SpriteAtlas(self.colors)
+        self._atlas.set_cell_size(self._geometry.cell_size)
+        self._glyphs = GlyphCache(self._font)
         self._queue = Cells()
         self._board = Cells(num_rows)
         self._piece = Cells(num_rows)
@@ -75,74 +92,173 @@ class View:  # pylint: disable=too-many-instance-attributes
             case pygame.QUIT:
                 raise SystemExit
             case pygame.KEYDOWN:
-                return self._handle_key_down(event.key, timer)
+                return self._handle_key_down(
+                    event.key, timer, getattr(event, "received_ns", None)
+                )
             case pygame.KEYUP:
                 self._handle_key_up(event.key, timer)
+            case pygame.VIDEORESIZE:
+                self.resize(event.size)
         return None
 
-    def paint(self, canvas: "Surface") -> None:
-        """Renders the screen."""
-        canvas.fill(0)
-        self._queue.paint(canvas, self.colors, CellStyle.SOLID)
-        self._board.paint(canvas, self.colors, self.styles)
-        self._piece.paint(canvas, self.colors, CellStyle.SOLID)
-        self._ghost.paint(canvas, self.colors, CellStyle.ALPHA)
+    @property
+    def has_changes(self) -> bool:
+        """Flag to indicate if anything has changed since the last paint."""
+        return (
+            self._layer_dirty
+            or self._piece_dirty
+            or self._stats_dirty
+            or any(label.updated for label in self._help)
+            or any(label.updated for label in self._overlay)
+        )
 
-        num_lines = 0
-        for label in self._help:
-            label.paint(canvas, self._geometry.get_hud_loc(0, num_lines))
-            num_lines += 1
+    def paint(self, canvas: "Surface") -> "list[Rect]":
+        """Renders the screen. The locked board, queue and labels are kept in
+        an off-screen layer which is only redrawn when they change, and the
+        current and ghost pieces and the stats are composited on top.
+
+        Returns:
+            The areas of the canvas which have changed since the last call.
+        """
+        if self._layer is None or self._layer.get_size() != canvas.get_size():
+            self._layer = Surface(canvas.get_size())
+            self._layer_dirty = True
+
+        if self._layer_dirty:
+            self._paint_layer(self._layer)
+            canvas.blit(self._layer, (0, 0))
+            dirty = [canvas.get_rect()]
+        elif self._piece_dirty or self._stats_dirty:
+            dirty = self._piece_rects if self._piece_dirty else []
+            dirty = dirty + (self._stats_rects if self._stats_dirty else [])
+            for rect in dirty:
+                canvas.blit(self._layer, rect, rect)
+        else:
+            return []
+
+        if self._layer_dirty or self._piece_dirty:
+            self._piece.paint(canvas, self._atlas, CellStyle.SOLID)
+            self._ghost.paint(canvas, self._atlas, CellStyle.ALPHA)
+            self._piece_rects = [
+                rect for rect in (self._piece.bounds, self._ghost.bounds) if rect
+            ]
+            dirty = dirty + self._piece_rects
+        if self._layer_dirty or self._stats_dirty:
+            self._stats_rects = self._paint_stats(canvas)
+            dirty = dirty + self._stats_rects
+        self._layer_dirty = False
+        self._piece_dirty = False
+        self._stats_dirty = False
+        return dirty
 
     def render_labels(self) -> None:
         """Renders the texts."""
-        for label in self._help:
-            label.render(self._font)
+        for label in self._help + self._overlay:
+            if label.updated:
+                label.render(self._font)
+                self._layer_dirty = True
+
+    def resize(self, size: tuple[int, int]) -> None:
+        """Lays out the view for a window of `size`. The board, pieces and
+        queue have to be set again afterwards.
+        """
+        self._geometry.resize(size)
+        self._atlas.set_cell_size(self._geometry.cell_size)
+        self._layer_dirty = True
+        self.needs_refresh = True
 
     def set_board(self, board: "Board") -> None:
         """Sets the colors and geometry of the game board."""
         self._board.clear()
+        grid = self._geometry.main_grid
         for line in board:
-            self._board.append(line, self._geometry.transform("main"))
+            self._board.append(line, grid)
+        self._layer_dirty = True
+        self.needs_refresh = False
+
+    def set_overlay(self, lines: list[str]) -> None:
+        """Sets the lines of text shown below the game controls and stats."""
+        if len(self._overlay) > len(lines):
+            del self._overlay[len(lines) :]
+            self._layer_dirty = True
+        for label, text in zip(self._overlay, lines):
+            if label.text != text:
+                label.set_text(text)
+        self._overlay.extend(Label(text) for text in lines[len(self._overlay) :])
+
+    def set_stats(self, lines: list[str]) -> None:
+        """Sets the lines of the stats panel, shown below the game controls."""
+        if lines != self._stats:
+            self._layer_dirty |= len(lines) != len(self._stats)
+            self._stats = lines
+            self._stats_dirty = True
 
     def set_piece(self, piece: "Piece", ghost: "GhostPiece") -> None:
         """Sets the colors and geometry of the current and ghost pieces."""
+        self._piece_dirty = True
         self._piece.clear()
         self._ghost.clear()
         self._piece.append(
-            ((coord, piece.mino) for coord in piece.coords),
-            self._geometry.transform("main"),
+            ((coord, piece.mino) for coord in piece.coords), self._geometry.main_grid
         )
         self._ghost.append(
-            ((coord, ghost.mino) for coord in ghost.coords),
-            self._geometry.transform("main"),
+            ((coord, ghost.mino) for coord in ghost.coords), self._geometry.main_grid
         )
 
     def set_queue(self, previews: "list[BasePiece]", hold: "BasePiece | None") -> None:
         """Sets the colors and geometry of the preview queue."""
+        self._layer_dirty = True
         self._queue.clear()
         if hold is not None:
             self._queue.append(
                 ((coord, hold.mino) for coord in hold.base_coords),
-                self._geometry.transform("hold"),
+                self._geometry.hold_grid,
             )
         for i, preview in enumerate(previews):
-            preview_cell = partial(self._geometry.transform("preview"), i)
             self._queue.append(
-                ((coord, preview.mino) for coord in preview.base_coords), preview_cell
+                ((coord, preview.mino) for coord in preview.base_coords),
+                self._geometry.preview_grid(i),
             )
 
-    def _handle_key_down(self, key: int, timer: "Timer") -> "Action | None":
+    def _handle_key_down(
+        self, key: int, timer: "Timer", pressed: int | None
+    ) -> "Action | None":
         action = self._controls.parse(key)
         if action is None:
             return None
         if action.can_das:
-            timer.start_autorepeat(action)
+            timer.start_autorepeat(action, pressed)
         return action
 
     def _handle_key_up(self, key: int, timer: "Timer") -> None:
         if (action := self._controls.parse(key)) is not None:
             timer.stop_autorepeat(action)
 
+    def _paint_layer(self, layer: "Surface") -> None:
+        """Paints everything except the current and ghost pieces."""
+        layer.fill(0)
+        self._queue.paint(layer, self._atlas, CellStyle.SOLID)
+        self._board.paint(layer, self._atlas, self.styles)
+
+        num_lines = 0
+        for label in self._help:
+            label.paint(layer, self._geometry.get_hud_loc(0, num_lines))
+            num_lines += 1
+        num_lines += len(self._stats)
+        group = 2 if self._stats else 1
+        for label in self._overlay:
+            label.paint(layer, self._geometry.get_hud_loc(group, num_lines))
+            num_lines += 1
+
+    def _paint_stats(self, canvas: "Surface") -> "list[Rect]":
+        """Paints the stats panel from cached glyphs, below the game controls."""
+        return [
+            self._glyphs.paint(
+                canvas, text, self._geometry.get_hud_loc(1, len(self._help) + line)
+            )
+            for line, text in enumerate(self._stats)
+        ]
+
     def _set_control_labels(self) -> None:
         # pylint: disable=line-too-long
         # fmt: off
@@ -151,6 +267,7 @@ class View:  # pylint: disable=too-many-instance-attributes
             ("CCW, CW", f"{self._controls.get_key_name(Action.ROTATE_CCW)}, {self._controls.get_key_name(Action.ROTATE_CW)}"),
             ("Soft Drop, Hard Drop", f"{self._controls.get_key_name(Action.SOFT_DROP)}, {self._controls.get_key_name(Action.HARD_DROP)}"),
             ("Hold", self._controls.get_key_name(Action.HOLD)),
+            ("Undo, Redo", f"{self._controls.get_key_name(Action.UNDO)}, {self._controls.get_key_name(Action.REDO)}"),
             ("Reset", self._controls.get_key_name(Action.RESET)),
         ]
         # fmt: on
@@ -0,0 +1,14 @@
+"""Command line arguments shared by the launch scripts."""
+
+import argparse
+from pathlib import Path
+
+from common.resource import get_resource_path
+
+
+def add_ruleset_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adds the `--settings` and `--ruleset` config paths to `parser`."""
+    parser.add_argument("--settings", type=Path, default=Path.cwd() / "settings.yml")
+    parser.add_argument(
+        "--ruleset", type=Path, default=get_resource_path("resource", "guideline.yml")
+    )
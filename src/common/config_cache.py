@@ -0,0 +1,111 @@
+"""Binary cache of objects compiled from config files."""
+
+import hashlib
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Callable, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# Bump when the format of the cache files changes. Changes to the code which
+# builds the cached objects are detected through the `code` of `load_cached`.
+CACHE_VERSION = 2
+
+SourceKey = tuple[str, int, int, str]
+
+
+def cache_path(
+    config_path: Path, kind: str = "cache", others: Sequence[Path] = ()
+) -> Path:
+    """Returns the cache file of `kind` stored next to `config_path`. The name
+    also depends on the location of the `others` files the object is built
+    from, so that each combination of files has a cache of its own.
+    """
+    if not others:
+        return config_path.with_name(f".{config_path.name}.{kind}")
+    located = "\n".join(str(Path(other).resolve()) for other in others)
+    digest = hashlib.sha256(located.encode()).hexdigest()[:8]
+    return config_path.with_name(f".{config_path.name}.{digest}.{kind}")
+
+
+def load_cached(
+    path: Path,
+    sources: Sequence[Path],
+    build: Callable[[], T],
+    code: Sequence[type] = (),
+) -> T:
+    """Returns the object cached at `path` if it was built from the current
+    contents of `sources`. Otherwise calls `build` and caches its result.
+
+    `code` lists the classes whose modules build the object. Their source
+    files are compared like `sources`, so a change to them rebuilds the cache.
+
+    Sources are compared by SHA-256 digest. Sources whose size and modification
+    time are unchanged are trusted without being read.
+    """
+    sources = [*sources, *_module_files(code)]
+    cached_keys = None
+    try:
+        with open(path, "rb") as infile:
+            version, cached_keys = pickle.load(infile)
+            keys = _source_keys(sources, cached_keys)
+            if version == _version() and _digests(keys) == _digests(cached_keys):
+                result = pickle.load(infile)
+                if keys != cached_keys:
+                    _store(path, keys, result)
+                return result
+    except Exception:  # pylint: disable=broad-exception-caught
+        cached_keys = None  # a missing or unreadable cache is rebuilt
+
+    result = build()
+    _store(path, _source_keys(sources, cached_keys), result)
+    return result
+
+
+def _module_files(code: Sequence[type]) -> list[Path]:
+    """Returns the source files of the modules which define `code`."""
+    files = []
+    for obj in code:
+        module_file = getattr(sys.modules[obj.__module__], "__file__", None)
+        if module_file is not None and Path(module_file) not in files:
+            files.append(Path(module_file))
+    return files
+
+
+def _version() -> tuple[int, tuple[int, ...]]:
+    return CACHE_VERSION, tuple(sys.version_info[:2])
+
+
+def _digests(keys: list[SourceKey]) -> list[tuple[str, str]]:
+    return [(key[0], key[3]) for key in keys]
+
+
+def _source_keys(
+    sources: Sequence[Path], cached_keys: list[SourceKey] | None
+) -> list[SourceKey]:
+    """Describes each source by path, size, mtime and digest. The digest is
+    reused from `cached_keys` when size and mtime have not changed.
+    """
+    known = {key[:3]: key[3] for key in cached_keys or []}
+    keys = []
+    for source in sources:
+        stat = os.stat(source)
+        stamp = (str(Path(source).resolve()), stat.st_size, stat.st_mtime_ns)
+        if (digest := known.get(stamp)) is None:
+            digest = hashlib.sha256(Path(source).read_bytes()).hexdigest()
+        keys.append((*stamp, digest))
+    return keys
+
+
+def _store(path: Path, keys: list[SourceKey], result: object) -> None:
+    """Writes the cache atomically. A read-only location is silently skipped."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as outfile:
+            pickle.dump((_version(), keys), outfile)
+            pickle.dump(result, outfile, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
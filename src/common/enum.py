@@ -16,6 +16,8 @@ class Action(Enum):
     ROTATE_CW = 5
     HOLD = 6
     RESET = 7
+    UNDO = 8
+    REDO = 9
 
     @property
     def can_das(self) -> bool:
@@ -39,6 +41,20 @@ class Direction(Vector2D, Enum):
     RIGHT = 1, 0
 
 
+class FinesseInput(Enum):
+    """Key presses counted by finesse. A DAS input holds the key until the
+    piece reaches the wall.
+    """
+
+    TAP_LEFT = 0
+    TAP_RIGHT = 1
+    DAS_LEFT = 2
+    DAS_RIGHT = 3
+    ROTATE_CCW = 4
+    ROTATE_CW = 5
+    HARD_DROP = 6
+
+
 class Mino(Enum):
     """Mino types."""
 
@@ -53,6 +69,24 @@ class Mino(Enum):
     GARBAGE = 8
 
 
+class Phase(Enum):
+    """Timed phases of the client main loop."""
+
+    EVENTS = "events"
+    ACTION = "handle_action"
+    UPDATE_VIEW = "update_view"
+    PAINT = "paint"
+    DISPLAY = "display_update"
+
+
+class Replacement(Enum):
+    """Transposition table replacement policies."""
+
+    ALWAYS = 0
+    DEPTH = 1
+    KEEP = 2
+
+
 class Rotation(Enum):
     """Rotation types."""
 
@@ -0,0 +1,123 @@
+"""Compact binary recording of game actions."""
+
+import struct
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from common.enum import Action
+
+MAGIC = b"PDSR"
+VERSION = 2
+ACTIONS = tuple(sorted(Action, key=lambda action: action.value))
+
+
+@dataclass
+class Replay:
+    """The seed of a game, the settings which change its random draws and every
+    action handled, each with the time elapsed since the previous action in
+    milliseconds.
+
+    Serialized as the magic bytes, a version byte, the seed and difficulty as
+    varints, the randomizer name as a varint length and ASCII bytes, the
+    messiness as a little-endian double, the number of holes as a varint, then
+    one varint delta and one action byte per action.
+    """
+
+    seed: int
+    difficulty: int
+    randomizer: str = "bag7"
+    messiness: float = 1.0
+    num_holes: int = 1
+    events: list[tuple[int, Action]] = field(default_factory=list)
+
+    def to_bytes(self) -> bytes:
+        """Serializes the replay."""
+        data = bytearray(MAGIC)
+        data.append(VERSION)
+        _write_varint(data, self.seed)
+        _write_varint(data, self.difficulty)
+        randomizer = self.randomizer.encode("ascii")
+        _write_varint(data, len(randomizer))
+        data.extend(randomizer)
+        data.extend(struct.pack("<d", self.messiness))
+        _write_varint(data, self.num_holes)
+        for delta, action in self.events:
+            _write_varint(data, delta)
+            data.append(action.value)
+        return bytes(data)
+
+    def save(self, path: Path) -> None:
+        """Writes the serialized replay to `path`."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self.to_bytes())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        """Deserializes a replay."""
+        if not data.startswith(MAGIC):
+            raise ValueError("Not a replay.")
+        pos = len(MAGIC)
+        if data[pos] == 1:
+            raise ValueError(
+                "Replay version 1 does not record the randomizer and cheese "
+                "settings, so it cannot be replayed faithfully."
+            )
+        if data[pos] != VERSION:
+            raise ValueError(f"Unsupported replay version: {data[pos]}")
+        seed, pos = _read_varint(data, pos + 1)
+        difficulty, pos = _read_varint(data, pos)
+        length, pos = _read_varint(data, pos)
+        randomizer = data[pos : pos + length].decode("ascii")
+        (messiness,) = struct.unpack_from("<d", data, pos + length)
+        num_holes, pos = _read_varint(data, pos + length + 8)
+        replay = cls(seed, difficulty, randomizer, messiness, num_holes)
+        while pos < len(data):
+            delta, pos = _read_varint(data, pos)
+            replay.events.append((delta, ACTIONS[data[pos]]))
+            pos += 1
+        return replay
+
+    @classmethod
+    def load(cls, path: Path) -> "Replay":
+        """Reads a serialized replay from `path`."""
+        return cls.from_bytes(path.read_bytes())
+
+
+@dataclass
+class ReplayRecorder:
+    """Appends actions to a replay, timestamping them as they arrive."""
+
+    replay: Replay
+    _last_ns: int = field(default_factory=time.perf_counter_ns, init=False)
+
+    def record(self, action: Action) -> None:
+        """Records `action` with the time elapsed since the previous one."""
+        delta = (time.perf_counter_ns() - self._last_ns) // 1_000_000
+        # Advance by whole milliseconds so rounding does not accumulate.
+        self._last_ns += delta * 1_000_000
+        self.replay.events.append((delta, action))
+
+
+def _write_varint(data: bytearray, value: int) -> None:
+    """Appends an unsigned LEB128 varint."""
+    while value > 0x7F:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    """Reads an unsigned LEB128 varint.
+
+    Returns:
+        The value and the position after it.
+    """
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
@@ -0,0 +1,17 @@
+"""Resource path lookup."""
+
+import sys
+from pathlib import Path
+
+
+def get_resource_path(*path: str) -> Path:
+    """Constructs resources path. Uses sys._MEIPASS if running from .exe built by
+    pyinstaller.
+    """
+    try:
+        # pylint: disable=protected-access
+        root_dir = Path(sys._MEIPASS)  # type: ignore[attr-defined]
+    except AttributeError:
+        root_dir = Path(__file__).resolve().parents[2]
+
+    return root_dir.joinpath(*path)
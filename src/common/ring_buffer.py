@@ -0,0 +1,178 @@
+"""Ring buffer."""
+
+from dataclasses import dataclass, field
+from typing import Callable, Generic, Iterable, Iterator, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class RingBuffer(Generic[T]):
+    """A ring buffer with fixed max size. Items are stored contiguously and can
+    be accessed by index in constant time. Appending to a full buffer evicts
+    the item at the opposite end.
+    """
+
+    size: int
+    curr_size: int = field(default=0, init=False)
+    _head: int = field(default=0, init=False)
+    _items: list = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._items = [None] * self.size
+
+    def __repr__(self) -> str:
+        return f"[{', '.join(map(str, self))}]"
+
+    def __len__(self) -> int:
+        return self.curr_size
+
+    def __getitem__(self, index: int) -> T:
+        if not 0 <= index < self.curr_size:
+            raise IndexError
+        return self._items[(self._head + index) % self.size]
+
+    def __setitem__(self, index: int, data: T) -> None:
+        if not 0 <= index < self.curr_size:
+            raise IndexError
+        self._items[(self._head + index) % self.size] = data
+
+    def __iter__(self) -> Iterator[T]:
+        for index in range(self.curr_size):
+            yield self._items[(self._head + index) % self.size]
+
+    def __reversed__(self) -> Iterator[T]:
+        for index in range(self.curr_size - 1, -1, -1):
+            yield self._items[(self._head + index) % self.size]
+
+    def to_tuple(self) -> tuple[T, ...]:
+        """Returns the items in order, copied with slices of the storage."""
+        end = self._head + self.curr_size
+        if end <= self.size:
+            return tuple(self._items[self._head : end])
+        return tuple(self._items[self._head :] + self._items[: end - self.size])
+
+    @property
+    def is_full(self) -> bool:
+        """Flag to indicate if the buffer is full."""
+        return self.curr_size == self.size
+
+    def append(self, data: T) -> None:
+        """Appends an item to the end of the buffer."""
+        if self.is_full:
+            self.popleft()
+        self._items[(self._head + self.curr_size) % self.size] = data
+        self.curr_size += 1
+
+    def appendleft(self, data: T) -> None:
+        """Appends an item to the start of the buffer."""
+        if self.is_full:
+            self.pop()
+        self._head = (self._head - 1) % self.size
+        self._items[self._head] = data
+        self.curr_size += 1
+
+    def extendleft(self, items: Sequence[T]) -> None:
+        """Appends items to the start of the buffer in one shift, in the same
+        order as repeated `appendleft` calls: the last item ends up first. Items
+        shifted past the end of a full buffer are evicted.
+        """
+        items = items[-self.size :]
+        count = len(items)
+        # The slots of the evicted items are the ones the new items move into.
+        self.curr_size = min(self.curr_size, self.size - count) + count
+        self._head = (self._head - count) % self.size
+        for index, data in enumerate(reversed(items)):
+            self._items[(self._head + index) % self.size] = data
+
+    def pop(self) -> T:
+        """Removes an item from the right side of the buffer."""
+        if self.curr_size == 0:
+            raise IndexError
+        self.curr_size -= 1
+        index = (self._head + self.curr_size) % self.size
+        data = self._items[index]
+        self._items[index] = None
+        return data
+
+    def popleft(self) -> T:
+        """Removes an item from the left side of the buffer."""
+        if self.curr_size == 0:
+            raise IndexError
+        data = self._items[self._head]
+        self._items[self._head] = None
+        self._head = (self._head + 1) % self.size
+        self.curr_size -= 1
+        return data
+
+    def remove_all(self, indices: Iterable[int]) -> list[T]:
+        """Removes the items at `indices` in one pass. Whichever side of the
+        removed indices holds fewer items is shifted to close the gaps: the items
+        after the first removed index towards the start of the buffer, or the
+        items before the last removed index towards the end, advancing the head.
+
+        Returns:
+            The removed items, in index order.
+        """
+        targets = sorted(set(indices))
+        if not targets:
+            return []
+        if targets[0] < 0 or targets[-1] >= self.curr_size:
+            raise IndexError
+        if self.curr_size - targets[0] <= targets[-1] + 1:
+            return self._remove_shifting_tail(targets)
+        return self._remove_shifting_head(targets)
+
+    def _remove_shifting_tail(self, targets: list[int]) -> list[T]:
+        removed = []
+        write = targets[0]
+        next_target = 0
+        for read in range(targets[0], self.curr_size):
+            data = self[read]
+            if next_target < len(targets) and read == targets[next_target]:
+                removed.append(data)
+                next_target += 1
+            else:
+                self._items[(self._head + write) % self.size] = data
+                write += 1
+        for index in range(write, self.curr_size):
+            self._items[(self._head + index) % self.size] = None
+        self.curr_size = write
+        return removed
+
+    def _remove_shifting_head(self, targets: list[int]) -> list[T]:
+        removed = []
+        write = targets[-1]
+        next_target = len(targets) - 1
+        for read in range(targets[-1], -1, -1):
+            data = self[read]
+            if next_target >= 0 and read == targets[next_target]:
+                removed.append(data)
+                next_target -= 1
+            else:
+                self._items[(self._head + write) % self.size] = data
+                write -= 1
+        for index in range(write + 1):
+            self._items[(self._head + index) % self.size] = None
+        self._head = (self._head + len(targets)) % self.size
+        self.curr_size -= len(targets)
+        removed.reverse()
+        return removed
+
+    @classmethod
+    def from_items(cls, size: int, items: Sequence[T]) -> "RingBuffer":
+        """Constructs a buffer with `size` holding `items`, first item first."""
+        buffer = cls(size)
+        buffer.curr_size = min(len(items), size)
+        buffer._items[: buffer.curr_size] = items[: buffer.curr_size]
+        return buffer
+
+    @classmethod
+    def fill_with_default(cls, size: int, factory: Callable[[], T]) -> "RingBuffer":
+        """Constructs a buffer with `size` and fill it with values generated by
+        `factory`.
+        """
+        buffer = cls(size)
+        while not buffer.is_full:
+            buffer.append(factory())
+        return buffer
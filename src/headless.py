@@ -0,0 +1,75 @@
+"""Headless simulation launch script. Does not depend on pygame."""
+
+import argparse
+import dataclasses
+import random
+from pathlib import Path
+
+from common.cli import add_ruleset_arguments
+from common.enum import Action
+from common.replay import MAGIC, Replay
+from model.ruleset import Ruleset
+from model.stacker import Stacker
+from simulation.runner import HeadlessRunner, format_board
+from simulation.script import load_script
+
+
+def parse_args() -> argparse.Namespace:
+    """Parses command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("input", type=Path, help="input script or replay to play")
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="number of times to play the script"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="seed for scripts")
+    parser.add_argument(
+        "--realtime", action="store_true", help="play replays at recorded speed"
+    )
+    add_ruleset_arguments(parser)
+    return parser.parse_args()
+
+
+def needs_history(actions: list[Action]) -> bool:
+    """Flag to indicate if `actions` undo or redo placements, which requires
+    the stacker to keep its history.
+    """
+    return Action.UNDO in actions or Action.REDO in actions
+
+
+def main():
+    """Plays the input and reports the final board and throughput."""
+    args = parse_args()
+    ruleset = Ruleset.from_config(args.settings, args.ruleset)
+
+    with open(args.input, "rb") as infile:
+        is_replay = infile.read(len(MAGIC)) == MAGIC
+    if is_replay:
+        replay = Replay.load(args.input)
+        ruleset = dataclasses.replace(
+            ruleset,
+            difficulty=replay.difficulty,
+            randomizer=replay.randomizer,
+            messiness=replay.messiness,
+            num_holes=replay.num_holes,
+        )
+        actions = [action for _, action in replay.events]
+        stacker = Stacker(
+            ruleset, random.Random(replay.seed), keep_history=needs_history(actions)
+        )
+        runner = HeadlessRunner(stacker)
+        runner.play(replay, args.realtime)
+    else:
+        actions = load_script(args.input)
+        stacker = Stacker(
+            ruleset, random.Random(args.seed), keep_history=needs_history(actions)
+        )
+        runner = HeadlessRunner(stacker)
+        for _ in range(args.repeat):
+            runner.run(actions)
+
+    print(format_board(runner.stacker.board, ruleset.num_visible_rows))
+    print(runner.stats)
+
+
+if __name__ == "__main__":
+    main()
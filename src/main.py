@@ -1,61 +1,189 @@
 """Game launch script."""
 
+import random
 import sys
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
 import pygame
+import yaml
 
 from client.controls import Controls
+from client.frame_scheduler import FrameScheduler
+from client.latency import LatencyTracker
+from client.metrics import FrameMetrics
 from client.presenter import Presenter
+from client.stats import SessionStats
 from client.timer import Timer
 from client.view import DEFAULT_SIZE, View
+from common.enum import Phase
+from common.replay import Replay, ReplayRecorder
+from common.resource import get_resource_path
+from model.finesse import FinesseTable
 from model.ruleset import Ruleset
 from model.stacker import Stacker
 
+if TYPE_CHECKING:
+    from pygame.surface import Surface
 
-def get_resource_path(*path: str) -> Path:
-    """Constructs resources path. Uses sys._MEIPASS if running from .exe built by
-    pyinstaller.
-    """
-    try:
-        # pylint: disable=protected-access
-        root_dir = Path(sys._MEIPASS)  # type: ignore[attr-defined]
-    except AttributeError:
-        root_dir = Path(__file__).resolve().parents[1]
+# How often the metrics overlay is refreshed, in nanoseconds.
+OVERLAY_PERIOD = 500_000_000
+# How often the stats panel is refreshed, in nanoseconds.
+STATS_PERIOD = 100_000_000
 
-    return root_dir.joinpath(*path)
 
+def load_settings(settings_path: Path) -> dict:
+    """Reads the client settings."""
+    with open(settings_path, encoding="utf8") as infile:
+        return yaml.safe_load(infile.read())
 
-def main():
+
+def create_screen(vsync: bool) -> "Surface":
+    """Opens the window, scaled with vsync and resizable without."""
+    if vsync:
+        return pygame.display.set_mode(DEFAULT_SIZE, pygame.SCALED, vsync=1)
+    return pygame.display.set_mode(DEFAULT_SIZE, pygame.RESIZABLE)
+
+
+def load_finesse(
+    setting: dict, ruleset: Ruleset, ruleset_path: Path
+) -> FinesseTable | None:
+    """Loads the finesse table unless finesse is turned off."""
+    if not setting.get("finesse", True):
+        return None
+    return FinesseTable.from_config(ruleset, ruleset_path)
+
+
+def create_overlays(
+    setting: dict, metrics: FrameMetrics, latency: LatencyTracker | None
+) -> list[Callable[[], list[str]]]:
+    """Returns the sources of the overlay lines enabled in the settings."""
+    overlays = []
+    if (setting.get("metrics") or {}).get("overlay", False):
+        overlays.append(metrics.overlay)
+    if latency is not None and (setting.get("latency") or {}).get("overlay", False):
+        overlays.append(latency.overlay)
+    return overlays
+
+
+def save_session(
+    setting: dict,
+    recorder: ReplayRecorder,
+    metrics: FrameMetrics,
+    latency: LatencyTracker | None,
+) -> None:
+    """Writes the replay, metrics and latency files enabled in the settings."""
+    if (replay_dir := setting.get("replay_dir")) is not None:
+        recorder.replay.save(
+            Path(replay_dir) / f"{time.strftime('%Y%m%d-%H%M%S')}.replay"
+        )
+    if (path := (setting.get("metrics") or {}).get("dump")) is not None:
+        metrics.dump(Path(path))
+    latency_path = (setting.get("latency") or {}).get("dump")
+    if latency is not None and latency_path is not None:
+        latency.dump(Path(latency_path))
+
+
+def main():  # pylint: disable=too-many-locals,too-many-statements
     """Main loop."""
+    settings_path = Path.cwd() / "settings.yml"
+    setting = load_settings(settings_path)
+    scheduler = FrameScheduler(setting.get("fps", 60), setting.get("vsync", False))
+    metrics = FrameMetrics("metrics" in setting)
+    latency = LatencyTracker() if "latency" in setting else None
+    stats = SessionStats() if setting.get("stats", True) else None
+
     pygame.init()
-    screen = pygame.display.set_mode(DEFAULT_SIZE)
+    screen = create_screen(scheduler.vsync)
     font = pygame.font.Font(get_resource_path("resource", "FiraCode-Regular.ttf"), 16)
 
     controls = Controls.from_config(get_resource_path("resource", "controls.yml"))
-    ruleset = Ruleset.from_config(
-        Path.cwd() / "settings.yml", get_resource_path("resource", "guideline.yml")
-    )
+    ruleset_path = get_resource_path("resource", "guideline.yml")
+    ruleset = Ruleset.from_config(settings_path, ruleset_path)
+    finesse = load_finesse(setting, ruleset, ruleset_path)
 
-    stacker = Stacker(ruleset)
-    view = View(ruleset.num_cols, ruleset.num_visible_rows, controls, font)
-    presenter = Presenter(stacker, view)
+    seed = random.randrange(1 << 32)
+    recorder = ReplayRecorder(
+        Replay(
+            seed,
+            ruleset.difficulty,
+            ruleset.randomizer,
+            ruleset.messiness,
+            ruleset.num_holes,
+        )
+    )
+    stacker = Stacker(
+        ruleset, random.Random(seed), keep_history=setting.get("undo", True)
+    )
+    view = View(
+        ruleset.num_cols,
+        ruleset.num_visible_rows,
+        ruleset.num_previews,
+        controls,
+        font,
+    )
+    presenter = Presenter(
+        stacker,
+        view,
+        recorder,
+        metrics if metrics.enabled else None,
+        latency,
+        stats,
+        finesse,
+    )
     timer = Timer(controls.das, controls.arr)
 
+    def handle_events(events: list[pygame.event.Event]) -> None:
+        for event in events:
+            presenter.handle(event, timer)
+
+    handle_events = metrics.timed(Phase.EVENTS, handle_events)
+    update_display = metrics.timed(Phase.DISPLAY, pygame.display.update)
+    overlays = create_overlays(setting, metrics, latency)
+    next_overlay = 0
+    next_stats = 0
+
     while True:
         timer.update()
-        for event in pygame.event.get():
-            try:
-                presenter.handle(event, timer)
-            except SystemExit:
-                pygame.quit()
-                sys.exit()
-
-        while (action := timer.poll()) is not None:
-            presenter.handle_action(action)
-
-        presenter.paint(screen)
-        pygame.display.update()
+        try:
+            handle_events(timer.events())
+        except SystemExit:
+            save_session(setting, recorder, metrics, latency)
+            pygame.quit()
+            sys.exit()
+
+        if (repeat := timer.poll()) is not None:
+            moved = presenter.handle_repeat(repeat.action, repeat.count)
+            if moved and latency is not None:
+                latency.repeat(repeat.action, repeat.scheduled, timer.latest)
+
+        if overlays and timer.latest >= next_overlay:
+            view.set_overlay([line for overlay in overlays for line in overlay()])
+            next_overlay = timer.latest + OVERLAY_PERIOD
+
+        if stats is not None and timer.latest >= next_stats:
+            view.set_stats(stats.lines(timer.latest))
+            next_stats = timer.latest + STATS_PERIOD
+
+        if presenter.has_changes and scheduler.is_frame_due(timer.latest):
+            rects = presenter.paint(screen)
+            timer.collect()
+            update_display(rects)
+            timer.collect()
+            scheduler.mark_frame(timer.latest)
+            if latency is not None:
+                latency.present(time.perf_counter_ns())
+
+        if timer.has_events:
+            continue
+        timer.update()
+        deadline = timer.next_deadline
+        if stats is not None:
+            deadline = next_stats if deadline is None else min(deadline, next_stats)
+        woken_by = scheduler.wait(timer.latest, deadline, presenter.has_changes)
+        if woken_by is not None:
+            timer.receive([woken_by])
 
 
 if __name__ == "__main__":
@@ -3,25 +3,33 @@
 import random
 from collections import deque
 from dataclasses import InitVar, dataclass, field
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+
+from model.randomizer import RANDOMIZERS
+from model.zobrist import QUEUE_KEYS
 
 if TYPE_CHECKING:
     from common.enum import Mino
+    from model.randomizer import Randomizer
     from model.ruleset import Ruleset
 
 
 @dataclass
 class Bag:
-    """Random bag with previews."""
+    """Random bag with previews. Minos are drawn from the randomizer of the
+    ruleset, as many at a time as the previews are short of.
+    """
 
     ruleset: InitVar["Ruleset"]
+    rng: InitVar[random.Random]
 
     previews: "deque[Mino]" = field(init=False)
-    _generator: "RandomBag" = field(init=False)
+    hash: int = field(default=0, init=False)
+    _randomizer: "Randomizer" = field(init=False)
 
-    def __post_init__(self, ruleset) -> None:
+    def __post_init__(self, ruleset: "Ruleset", rng: random.Random) -> None:
         self.previews = deque([], maxlen=ruleset.num_previews)
-        self._generator = iter(RandomBag(ruleset.mino_types))
+        self._randomizer = RANDOMIZERS[ruleset.randomizer](ruleset.mino_types, rng)
         self._refill(ruleset.num_previews)
 
     @property
@@ -33,31 +41,22 @@ class Bag:
 
         return mino
 
-    def _refill(self, num_previews: int) -> None:
-        while len(self.previews) < num_previews:
-            self.previews.append(next(self._generator))
-
-
-@dataclass
-class RandomBag:
-    """Endless bag of minos which shuffles when a full bag has been read."""
-
-    _source: "list[Mino]"
-    _index: int = field(default=0, init=False)
-    _size: int = field(init=False)
-
-    def __post_init__(self):
-        self._size = len(self._source)
-        random.shuffle(self._source)
-
-    def __iter__(self) -> "RandomBag":
-        self._index = 0
-        return self
+    def snapshot(self) -> "tuple[tuple[Mino, ...], int, Any]":
+        """Captures the previews and the state of the randomizer."""
+        return tuple(self.previews), self.hash, self._randomizer.snapshot()
 
-    def __next__(self) -> "Mino":
-        mino = self._source[self._index]
-        self._index = (self._index + 1) % self._size
-        if self._index == 0:
-            random.shuffle(self._source)
+    def restore(self, state: "tuple[tuple[Mino, ...], int, Any]") -> None:
+        """Returns the bag to a state captured by `snapshot`."""
+        previews, self.hash, randomizer = state
+        self.previews.clear()
+        self.previews.extend(previews)
+        self._randomizer.restore(randomizer)
 
-        return mino
+    def _refill(self, num_previews: int) -> None:
+        if len(self.previews) < num_previews:
+            self.previews.extend(
+                self._randomizer.generate(num_previews - len(self.previews))
+            )
+        self.hash = 0
+        for keys, mino in zip(QUEUE_KEYS, self.previews):
+            self.hash ^= keys[mino.value]
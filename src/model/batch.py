@@ -0,0 +1,177 @@
+"""Vectorized operations over many boards at once.
+
+Requires numpy, which is an optional dependency: nothing else in the package
+imports this module.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Sequence
+
+try:
+    import numpy as np
+except ImportError as ex:
+    raise ImportError("model.batch requires numpy: pip install numpy") from ex
+
+from common.enum import Mino
+from model.board import Board
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+    from model.shape import Shape
+
+EMPTY = Mino.EMPTY.value
+GARBAGE = Mino.GARBAGE.value
+
+
+@dataclass
+class BoardBatch:
+    """N boards held as an (N, rows, cols) uint8 array of mino values, bottom
+    row first. Mirrors the semantics of `Board`.
+    """
+
+    cells: "NDArray[np.uint8]"
+
+    @property
+    def num_boards(self) -> int:
+        """Number of boards in the batch."""
+        return self.cells.shape[0]
+
+    @property
+    def num_rows(self) -> int:
+        """Number of rows of each board."""
+        return self.cells.shape[1]
+
+    @property
+    def num_cols(self) -> int:
+        """Number of columns of each board."""
+        return self.cells.shape[2]
+
+    @property
+    def occupied(self) -> "NDArray[np.bool_]":
+        """(N, rows, cols) flags of non-empty cells."""
+        return self.cells != EMPTY
+
+    @property
+    def row_masks(self) -> "NDArray[np.int64]":
+        """(N, rows) occupancy masks packed the same way as `Line.mask`."""
+        weights = np.left_shift(1, np.arange(self.num_cols, dtype=np.int64))
+        return self.occupied.astype(np.int64) @ weights
+
+    def has_collision(
+        self, shape: "Shape", xs: "ArrayLike", ys: "ArrayLike"
+    ) -> "NDArray[np.bool_]":
+        """Checks, for every board, if `shape` placed with its origin at
+        (`xs[i]`, `ys[i]`) collides with the cells or the walls. `xs` and `ys`
+        may be scalars to test the same position on all boards.
+        """
+        cols, rows, in_bounds = self._locate(shape, xs, ys)
+        index = np.arange(self.num_boards)[:, None]
+        occupied = self.cells[
+            index, rows.clip(0, self.num_rows - 1), cols.clip(0, self.num_cols - 1)
+        ]
+        return ~in_bounds.all(axis=1) | (occupied != EMPTY).any(axis=1)
+
+    def finalize(
+        self,
+        mino: Mino,
+        shape: "Shape",
+        xs: "ArrayLike",
+        ys: "ArrayLike",
+        where: "ArrayLike | None" = None,
+    ) -> None:
+        """Sets the piece in every board selected by `where`, all boards by
+        default. The piece must fit within the walls of the selected boards.
+        """
+        cols, rows, in_bounds = self._locate(shape, xs, ys)
+        if where is None:
+            selected = np.ones(self.num_boards, dtype=np.bool_)
+        else:
+            selected = np.asarray(where, dtype=np.bool_)
+        if not in_bounds[selected].all():
+            raise IndexError("Piece is out of bounds.")
+        index = np.broadcast_to(np.arange(self.num_boards)[:, None], cols.shape)
+        self.cells[index[selected], rows[selected], cols[selected]] = mino.value
+
+    def full_lines(self) -> "NDArray[np.bool_]":
+        """(N, rows) flags of full lines."""
+        return np.all(self.occupied, axis=2)
+
+    def sift(self) -> "NDArray[np.int64]":
+        """Removes lines that are full and appends the same number of empty
+        lines on every board.
+
+        Returns:
+            The number of lines removed from each board.
+        """
+        full = self.full_lines()
+        num_removed = full.sum(axis=1)
+        if not num_removed.any():
+            return num_removed
+        order = np.argsort(full, axis=1, kind="stable")
+        self.cells = np.take_along_axis(self.cells, order[:, :, None], axis=1)
+        cleared = np.arange(self.num_rows) >= (self.num_rows - num_removed)[:, None]
+        self.cells[cleared] = EMPTY
+        return num_removed
+
+    def insert_below(self, holes: "ArrayLike") -> None:
+        """Inserts garbage lines at the bottom of every board, evicting the top
+        lines.
+
+        Args:
+            holes: (N,) hole columns for one line per board, or (N, K) hole
+                columns for K lines per board, inserted in order so the last
+                column ends up at the bottom.
+        """
+        holes = np.asarray(holes)
+        if holes.ndim == 1:
+            holes = holes[:, None]
+        num_lines = min(holes.shape[1], self.num_rows)
+        holes = holes[:, ::-1][:, :num_lines]
+        garbage = np.full(
+            (self.num_boards, num_lines, self.num_cols), GARBAGE, dtype=np.uint8
+        )
+        np.put_along_axis(garbage, holes[:, :, None], EMPTY, axis=2)
+        self.cells = np.concatenate(
+            (garbage, self.cells[:, : self.num_rows - num_lines]), axis=1
+        )
+
+    def to_boards(self) -> list[Board]:
+        """Converts every board to a `Board`."""
+        return [
+            Board.from_values(row.tobytes() for row in cells) for cells in self.cells
+        ]
+
+    def _locate(
+        self, shape: "Shape", xs: "ArrayLike", ys: "ArrayLike"
+    ) -> "tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.bool_]]":
+        """Returns the (N, cells) columns, rows and in-bounds flags of `shape`
+        placed at (`xs`, `ys`) on every board.
+        """
+        dx, dy = np.array(shape.cells, dtype=np.int64).T
+        xs = np.broadcast_to(np.asarray(xs, dtype=np.int64), (self.num_boards,))
+        ys = np.broadcast_to(np.asarray(ys, dtype=np.int64), (self.num_boards,))
+        cols = xs[:, None] + dx
+        rows = ys[:, None] + dy
+        in_bounds = (
+            (cols >= 0) & (cols < self.num_cols) & (rows >= 0) & (rows < self.num_rows)
+        )
+        return cols, rows, in_bounds
+
+    @classmethod
+    def empty(cls, num_boards: int, num_cols: int, num_rows: int) -> "BoardBatch":
+        """Constructs a batch of empty boards."""
+        return cls(np.full((num_boards, num_rows, num_cols), EMPTY, dtype=np.uint8))
+
+    @classmethod
+    def from_boards(cls, boards: Sequence[Board]) -> "BoardBatch":
+        """Constructs a batch from copies of `boards`."""
+        return cls(
+            np.array(
+                [
+                    [np.frombuffer(row, dtype=np.uint8) for row in board.to_values()]
+                    for board in boards
+                ],
+                dtype=np.uint8,
+            )
+        )
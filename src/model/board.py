@@ -1,30 +1,64 @@
 """The board which contains lines of colored cells."""
 
+import itertools
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Iterable
+from typing import TYPE_CHECKING, Iterable, Sequence
 
-from common.doubly_linked_list import DoublyLinkedList
 from common.enum import Mino
+from common.ring_buffer import RingBuffer
 from common.vector import Vector2D
 from model.line import Line
+from model.zobrist import MASK, ROW_BASE, inverse_row_power, row_powers
 
 if TYPE_CHECKING:
     from model.piece import Piece
+    from model.shape import Shape
+
+# Source of the tokens which mark the lines a board may modify in place.
+_OWNERS = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class BoardSnapshot:
+    """The lines and derived state of a board at one point in time. The lines
+    are shared with the board and must not be modified.
+    """
+
+    lines: tuple[Line, ...]
+    columns: tuple[int, ...]
+    touched_rows: frozenset[int]
+    hash: int
 
 
 @dataclass
-class Board:
-    """The board which contains lines of colored cells."""
+class Board:  # pylint: disable=too-many-instance-attributes
+    """The board which contains lines of colored cells.
+
+    Alongside the lines, the board keeps one occupancy mask per column, with bit
+    `y` set when the cell in row `y` is not empty, so column heights and drop
+    distances are available without walking the lines.
+
+    `hash` is kept up to date as the sum of each line hash times `ROW_BASE`
+    raised to the row index, modulo 2^64.
+
+    Lines are copy-on-write: a snapshot shares them with the board, which copies
+    a line before it first modifies it.
+    """
 
     _num_cols: int
     _num_rows: int
     _row_idx: int = field(default=0, init=False)
-    _lines: DoublyLinkedList[Line] = field(init=False)
+    _lines: RingBuffer[Line] = field(init=False)
+    _columns: list[int] = field(init=False)
+    _powers: tuple[int, ...] = field(init=False)
+    _touched_rows: set[int] = field(default_factory=set, init=False)
+    _owner: int = field(default_factory=lambda: next(_OWNERS), init=False)
+    hash: int = field(default=0, init=False)
 
     def __post_init__(self) -> None:
-        self._lines = DoublyLinkedList.fill_with_default(
-            self._num_rows, lambda: Line(self._num_cols)
-        )
+        self._lines = RingBuffer.fill_with_default(self._num_rows, self._new_line)
+        self._columns = [0] * self._num_cols
+        self._powers = row_powers(self._num_rows)
 
     def __getitem__(self, coord: Vector2D) -> Mino:
         if not 0 <= coord.y < self._num_rows or not 0 <= coord.x < self._num_cols:
@@ -43,35 +77,221 @@ class Board:
         return ((Vector2D(col, self._row_idx - 1), mino) for col, mino in line)
 
     def __setitem__(self, coord: Vector2D, mino: Mino) -> None:
-        self._lines[coord.y][coord.x] = mino
+        line = self._lines[coord.y]
+        if line.owner != self._owner:
+            line = line.copy(self._owner)
+            self._lines[coord.y] = line
+        prev_hash = line.hash
+        line[coord.x] = mino
+        self._touched_rows.add(coord.y)
+        self.hash = (self.hash + (line.hash - prev_hash) * self._powers[coord.y]) & MASK
+        if mino == Mino.EMPTY:
+            self._columns[coord.x] &= ~(1 << coord.y)
+        else:
+            self._columns[coord.x] |= 1 << coord.y
+
+    @property
+    def heights(self) -> list[int]:
+        """The height of the highest occupied cell of each column."""
+        return [column.bit_length() for column in self._columns]
+
+    @property
+    def garbage_rows(self) -> int:
+        """Bitmask with bit `y` set when row `y` contains garbage cells."""
+        return sum(1 << row for row, line in enumerate(self._lines) if line.is_garbage)
+
+    @property
+    def key(self) -> tuple[int, ...]:
+        """Occupancy masks of all rows, bottom row first. Usable as a dict key
+        for the shape of the stack.
+        """
+        return tuple(line.mask for line in self._lines)
 
     def finalize(self, piece: "Piece") -> None:
         """Sets the piece in the board."""
         for coord in piece.coords:
             self[coord] = piece.mino
 
+    def drop_distance(self, shape: "Shape", x: int, y: int) -> int:
+        """Returns the number of rows `shape`, placed without collision with its
+        origin at (`x`, `y`), can drop before landing on a cell or the floor.
+        """
+        distance = self._num_rows
+        for dx, dy in shape.bottoms:
+            row = y + dy
+            below = self._columns[x + dx] & ((1 << row) - 1)
+            distance = min(distance, row - below.bit_length())
+        return distance
+
     def has_collision(self, coords: Iterable[Vector2D]) -> bool:
         """Checks if the provided `target` has collision with any cells in the
         board or the walls.
+
+        The coordinates are grouped into one bitmask per row so each row is
+        looked up once and tested against its occupancy mask.
+        """
+        row_masks: dict[int, int] = {}
+        for coord in coords:
+            if not 0 <= coord.y < self._num_rows or not 0 <= coord.x < self._num_cols:
+                return True
+            row_masks[coord.y] = row_masks.get(coord.y, 0) | 1 << coord.x
+        return any(self._lines[y].mask & bits for y, bits in row_masks.items())
+
+    def has_collision_at(self, shape: "Shape", x: int, y: int) -> bool:
+        """Checks if `shape` placed with its origin at (`x`, `y`) has collision
+        with any cells in the board or the walls.
         """
-        try:
-            return any(self[coord] != Mino.EMPTY for coord in coords)
-        except IndexError:
+        if (
+            x + shape.left < 0
+            or x + shape.right >= self._num_cols
+            or y + shape.bottom < 0
+            or y + shape.top >= self._num_rows
+        ):
             return True
+        for dy, bits in shape.rows:
+            if self._lines[y + dy].mask & (bits << x if x >= 0 else bits >> -x):
+                return True
+        return False
 
     def insert_below(self, line: Line) -> None:
         """Insert `line` at the bottom of the board."""
+        if self._lines.is_full:
+            evicted = self._lines[self._num_rows - 1].hash * self._powers[-1]
+            self.hash = ((self.hash - evicted) * ROW_BASE + line.hash) & MASK
+        else:
+            self.hash = (self.hash * ROW_BASE + line.hash) & MASK
         self._lines.appendleft(line)
+        self._touched_rows = {
+            row + 1 for row in self._touched_rows if row + 1 < self._num_rows
+        }
+        if line.is_full:
+            self._touched_rows.add(0)
+        full = (1 << self._num_rows) - 1
+        for col, column in enumerate(self._columns):
+            self._columns[col] = (column << 1 | line.mask >> col & 1) & full
 
-    def sift(self) -> None:
+    def insert_below_many(self, lines: Sequence[Line]) -> None:
+        """Inserts `lines` at the bottom of the board with a single shift, as
+        repeated `insert_below` calls would: the last line ends up at the bottom.
+        """
+        lines = lines[-self._num_rows :]
+        count = len(lines)
+        if not count:
+            return
+        evicted = 0
+        for row in range(self._num_rows - count, len(self._lines)):
+            evicted += self._lines[row].hash * self._powers[row]
+        added = 0
+        for power, line in zip(self._powers, reversed(lines)):
+            added += line.hash * power
+        shift = self._powers[count] if count < self._num_rows else 0
+        self.hash = ((self.hash - evicted) * shift + added) & MASK
+
+        self._lines.extendleft(lines)
+        self._touched_rows = {
+            row + count for row in self._touched_rows if row + count < self._num_rows
+        }
+        self._touched_rows.update(
+            row for row, line in enumerate(reversed(lines)) if line.is_full
+        )
+        full = (1 << self._num_rows) - 1
+        for col, column in enumerate(self._columns):
+            bits = 0
+            for line in lines:
+                bits = bits << 1 | line.mask >> col & 1
+            self._columns[col] = (column << count | bits) & full
+
+    def to_values(self) -> list[bytes]:
+        """Returns the mino values of every row, bottom row first."""
+        return [line.values for line in self._lines]
+
+    @classmethod
+    def from_values(cls, rows: "Iterable[bytes]") -> "Board":
+        """Constructs a board from the mino values of every row, bottom row
+        first.
+        """
+        rows = list(rows)
+        board = cls(len(rows[0]), len(rows))
+        board.insert_below_many([Line.from_values(line) for line in reversed(rows)])
+        return board
+
+    def sift(self) -> list[Line]:
         """Removes lines that are full and appends the same number of empty
-        lines.
+        lines. Only the rows modified since the last call are checked.
+
+        The column masks and the hash are updated for the rows that move, on
+        whichever side of the removed rows is shorter: the rows below them move
+        up by one row per removed row below, so the hash of the rows above only
+        needs dividing by `ROW_BASE` to the number of removed rows.
+
+        Returns:
+            The removed lines.
+        """
+        full_rows = sorted(
+            row for row in self._touched_rows if self._lines[row].is_full
+        )
+        self._touched_rows.clear()
+        if not full_rows:
+            return []
+        count = len(full_rows)
+        lowest, highest = full_rows[0], full_rows[-1]
+        from_below = highest + 1 <= self._num_rows - lowest
+        if from_below:
+            rows = range(highest + 1)
+            old = self._partial_hash(rows)
+            self.hash = (self.hash - old) * inverse_row_power(count) & MASK
+        else:
+            rows = range(lowest, self._num_rows)
+            self.hash = (self.hash - self._partial_hash(rows)) & MASK
+
+        segments = [(0, (1 << lowest) - 1, 0)]
+        for shift, (row, next_row) in enumerate(
+            zip(full_rows, full_rows[1:] + [self._num_rows]), 1
+        ):
+            segments.append((row + 1, (1 << next_row - row - 1) - 1, row + 1 - shift))
+        self._columns = [
+            sum((column >> start & bits) << end for start, bits, end in segments)
+            for column in self._columns
+        ]
+
+        removed = self._lines.remove_all(full_rows)
+        for _ in removed:
+            self._lines.append(self._new_line())
+        if from_below:
+            rows = range(highest + 1 - count)
+        else:
+            rows = range(lowest, self._num_rows - count)
+        self.hash = (self.hash + self._partial_hash(rows)) & MASK
+        return removed
+
+    def snapshot(self) -> BoardSnapshot:
+        """Captures the board without copying any line."""
+        self._owner = next(_OWNERS)
+        return BoardSnapshot(
+            self._lines.to_tuple(),
+            tuple(self._columns),
+            frozenset(self._touched_rows),
+            self.hash,
+        )
+
+    def restore(self, snapshot: BoardSnapshot) -> None:
+        """Returns the board to `snapshot`, which stays valid."""
+        self._owner = next(_OWNERS)
+        self._lines = RingBuffer.from_items(self._num_rows, snapshot.lines)
+        self._columns = list(snapshot.columns)
+        self._touched_rows = set(snapshot.touched_rows)
+        self.hash = snapshot.hash
+
+    def _new_line(self) -> Line:
+        line = Line(self._num_cols)
+        line.owner = self._owner
+        return line
+
+    def _partial_hash(self, rows: range) -> int:
+        """Combines the hashes of the lines in `rows` as they count towards the
+        board hash.
         """
-        num_removed = 0
-        for line in reversed(self._lines):
-            if line.data.is_full:
-                self._lines.remove(line)
-                num_removed += 1
-        while num_removed != 0:
-            self._lines.append(Line(self._num_cols))
-            num_removed -= 1
+        result = 0
+        for row in rows:
+            result += self._lines[row].hash * self._powers[row]
+        return result & MASK
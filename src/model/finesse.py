@@ -0,0 +1,151 @@
+"""Minimal inputs to place each piece on an empty field."""
+
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from common.config_cache import cache_path, load_cached
+from common.enum import FinesseInput, Mino
+from common.vector import Vector2D
+from model.board import Board
+from model.shape import Shape
+
+if TYPE_CHECKING:
+    from model.ruleset import Ruleset
+
+# Resting cells of a piece, shifted down so that the lowest cell is in row 0.
+Footprint = frozenset[tuple[int, int]]
+
+MOVES = (
+    (FinesseInput.TAP_LEFT, -1, False),
+    (FinesseInput.TAP_RIGHT, 1, False),
+    (FinesseInput.DAS_LEFT, -1, True),
+    (FinesseInput.DAS_RIGHT, 1, True),
+)
+ROTATIONS = ((FinesseInput.ROTATE_CW, 1), (FinesseInput.ROTATE_CCW, -1))
+
+
+def footprint(coords: "Iterable[Vector2D]") -> Footprint:
+    """Returns the footprint of a piece resting at `coords`."""
+    cells = [(coord.x, coord.y) for coord in coords]
+    bottom = min(y for _, y in cells)
+    return frozenset((x, y - bottom) for x, y in cells)
+
+
+@dataclass(frozen=True)
+class FinesseTable:
+    """The shortest input sequence which places each mino at each resting
+    position of an empty field, keyed by the footprint of the position, so that
+    rotations covering the same cells share an entry.
+    """
+
+    tables: dict[Mino, dict[Footprint, tuple[FinesseInput, ...]]]
+
+    def optimal(
+        self, mino: Mino, coords: "Iterable[Vector2D]"
+    ) -> tuple[FinesseInput, ...] | None:
+        """Returns the shortest inputs which place `mino` at `coords`, if the
+        position is reachable on an empty field.
+        """
+        return self.tables[mino].get(footprint(coords))
+
+    def is_fault(self, mino: Mino, coords: "Iterable[Vector2D]", presses: int) -> bool:
+        """Flag to indicate if placing `mino` at `coords` with `presses` key
+        presses, including the hard drop, took more than necessary.
+        """
+        optimal = self.optimal(mino, coords)
+        return optimal is not None and presses > len(optimal)
+
+    @classmethod
+    def build(cls, ruleset: "Ruleset") -> "FinesseTable":
+        """Searches the inputs of every mino of `ruleset`."""
+        board = Board(ruleset.num_cols, ruleset.num_rows)
+        return cls({mino: _search(ruleset, board, mino) for mino in ruleset.shapes})
+
+    @classmethod
+    def from_config(cls, ruleset: "Ruleset", config_path: Path) -> "FinesseTable":
+        """Builds the table of `ruleset`, which was read from `config_path`. The
+        table is cached next to the config file until it or the code which
+        compiles the ruleset or searches the table changes.
+        """
+        return load_cached(
+            cache_path(config_path, "finesse.cache"),
+            [config_path],
+            lambda: cls.build(ruleset),
+            [cls, Board, type(ruleset), Shape],
+        )
+
+
+# Position of a piece during the search: the origin and the rotation.
+State = tuple[int, int, int]
+
+
+def _search(
+    ruleset: "Ruleset", board: Board, mino: Mino
+) -> dict[Footprint, tuple[FinesseInput, ...]]:
+    """Breadth first search from the spawn position, where every input costs
+    one key press.
+    """
+    origin = ruleset.get_origin(mino)
+    start = (origin.x, origin.y, 0)
+    paths: dict[State, tuple[FinesseInput, ...]] = {start: ()}
+    queue = deque([start])
+    table: dict[Footprint, tuple[FinesseInput, ...]] = {}
+    while queue:
+        state = queue.popleft()
+        key = _resting_footprint(ruleset, board, mino, state)
+        table.setdefault(key, (*paths[state], FinesseInput.HARD_DROP))
+        for next_state, finesse_input in _neighbours(ruleset, board, mino, state):
+            if next_state not in paths:
+                paths[next_state] = (*paths[state], finesse_input)
+                queue.append(next_state)
+    return table
+
+
+def _resting_footprint(
+    ruleset: "Ruleset", board: Board, mino: Mino, state: State
+) -> Footprint:
+    """Returns the footprint of `mino` hard dropped from `state`."""
+    x, y, rot = state
+    shape = ruleset.shapes[mino][rot]
+    rest = y - board.drop_distance(shape, x, y)
+    return footprint(Vector2D(c.x + x, c.y + rest) for c in shape.coords)
+
+
+def _neighbours(
+    ruleset: "Ruleset", board: Board, mino: Mino, state: State
+) -> list[tuple[State, FinesseInput]]:
+    """Returns the states one input away from `state`, along with the input."""
+    return [
+        *_shifts(ruleset, board, mino, state),
+        *_rotations(ruleset, board, mino, state),
+    ]
+
+
+def _shifts(
+    ruleset: "Ruleset", board: Board, mino: Mino, state: State
+) -> Iterator[tuple[State, FinesseInput]]:
+    x, y, rot = state
+    shape = ruleset.shapes[mino][rot]
+    for finesse_input, dx, hold in MOVES:
+        steps = 0
+        while not board.has_collision_at(shape, x + dx * (steps + 1), y):
+            steps += 1
+            if not hold:
+                break
+        if steps:
+            yield (x + dx * steps, y, rot), finesse_input
+
+
+def _rotations(
+    ruleset: "Ruleset", board: Board, mino: Mino, state: State
+) -> Iterator[tuple[State, FinesseInput]]:
+    x, y, rot = state
+    for finesse_input, dr in ROTATIONS:
+        rot_dst = (rot + dr) % ruleset.num_rots
+        shape = ruleset.shapes[mino][rot_dst]
+        for dx, dy in ruleset.kick_tables[mino].get((rot, rot_dst), ()):
+            if not board.has_collision_at(shape, x + dx, y + dy):
+                yield (x + dx, y + dy, rot_dst), finesse_input
+                break
@@ -0,0 +1,54 @@
+"""Generator of cheese garbage lines."""
+
+import random
+from dataclasses import dataclass, field
+
+from model.line import Line
+
+
+@dataclass
+class CheeseGenerator:
+    """Generates garbage lines with `num_holes` empty cells each.
+
+    Every line keeps the hole columns of the line before it, except with
+    probability `messiness` where they are drawn again. With a messiness of 1
+    the holes of every line are drawn independently.
+    """
+
+    num_cols: int
+    rng: random.Random = field(default_factory=random.Random)
+    messiness: float = 1.0
+    num_holes: int = 1
+    _holes: tuple[int, ...] = field(default=(), init=False)
+
+    def holes(self, count: int) -> list[tuple[int, ...]]:
+        """Draws the hole columns of the next `count` lines."""
+        result = []
+        for _ in range(count):
+            if (
+                not self._holes
+                or self.messiness >= 1
+                or self.rng.random() < self.messiness
+            ):
+                self._holes = self._draw()
+            result.append(self._holes)
+        return result
+
+    def generate(self, count: int) -> list[Line]:
+        """Generates the next `count` lines, in the order in which they are
+        inserted below the board.
+        """
+        return [Line.as_garbage(self.num_cols, *holes) for holes in self.holes(count)]
+
+    def snapshot(self) -> tuple[int, ...]:
+        """Captures the holes of the last line, apart from the generator."""
+        return self._holes
+
+    def restore(self, state: tuple[int, ...]) -> None:
+        """Returns the generator to a state captured by `snapshot`."""
+        self._holes = state
+
+    def _draw(self) -> tuple[int, ...]:
+        if self.num_holes == 1:
+            return (self.rng.randrange(self.num_cols),)
+        return tuple(self.rng.sample(range(self.num_cols), self.num_holes))
@@ -1,23 +1,36 @@
 """A line of the board."""
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 from common.enum import Mino
+from model.zobrist import CELL_KEYS
+
+MINOS = tuple(sorted(Mino, key=lambda mino: mino.value))
 
 
 @dataclass
 class Line:
-    """A line of the board."""
+    """A line of the board. Occupancy is kept as a bitmask, with bit `i` set when
+    cell `i` is not empty, and the colors are kept as a compact array of mino
+    values. `hash` is the XOR of the Zobrist keys of its cells.
+
+    `owner` identifies the board allowed to modify the line in place. Lines are
+    shared between a board and its snapshots, and copied before they change.
+    """
 
     _size: int
     _index: int = field(default=0, init=False)
-    _cells: list[Mino] = field(init=False)
+    _cells: bytearray = field(init=False)
+    mask: int = field(default=0, init=False)
+    hash: int = field(default=0, init=False)
+    owner: int = field(default=0, init=False)
 
     def __post_init__(self) -> None:
-        self._cells = [Mino.EMPTY] * self._size
+        self._cells = bytearray([Mino.EMPTY.value]) * self._size
 
     def __getitem__(self, index: int) -> Mino:
-        return self._cells[index]
+        return MINOS[self._cells[index]]
 
     def __iter__(self) -> "Line":
         self._index = 0
@@ -26,28 +39,87 @@ class Line:
     def __next__(self) -> tuple[int, Mino]:
         if self._index >= self._size:
             raise StopIteration
-        mino = self._cells[self._index]
+        mino = MINOS[self._cells[self._index]]
         self._index += 1
         return self._index - 1, mino
 
     def __setitem__(self, index: int, mino: Mino) -> None:
-        self._cells[index] = mino
+        keys = CELL_KEYS[index]
+        self.hash ^= keys[self._cells[index]] ^ keys[mino.value]
+        self._cells[index] = mino.value
+        if mino == Mino.EMPTY:
+            self.mask &= ~(1 << index)
+        else:
+            self.mask |= 1 << index
+
+    @property
+    def full_mask(self) -> int:
+        """The occupancy mask of a full line."""
+        return (1 << self._size) - 1
 
     @property
     def is_full(self) -> bool:
         """Flag to indicate of line is full."""
-        return not any(cell == Mino.EMPTY for cell in self._cells)
+        return self.mask == self.full_mask
+
+    @property
+    def is_garbage(self) -> bool:
+        """Flag to indicate if line contains garbage cells."""
+        return Mino.GARBAGE.value in self._cells
+
+    def copy(self, owner: int = 0) -> "Line":
+        """Returns a copy of the line, modifiable in place by `owner`."""
+        line = Line(self._size)
+        line._cells[:] = self._cells  # pylint: disable=protected-access
+        line.mask = self.mask
+        line.hash = self.hash
+        line.owner = owner
+        return line
+
+    @property
+    def values(self) -> bytes:
+        """The mino value of every cell."""
+        return bytes(self._cells)
+
+    @classmethod
+    def from_values(cls, values: bytes) -> "Line":
+        """Constructs from the mino value of every cell."""
+        line = cls(len(values))
+        line._cells[:] = values
+        empty = Mino.EMPTY.value
+        line.mask = sum(1 << i for i, value in enumerate(values) if value != empty)
+        line.hash = _hash(line._cells)
+        return line
 
     @classmethod
-    def as_garbage(cls, size: int, hole: int) -> "Line":
+    def as_garbage(cls, size: int, *holes: int) -> "Line":
         """Constructs as a garbage line.
 
         Args:
             size: Size of the line.
-            hole: Position of the empty cell.
+            holes: Positions of the empty cells.
         """
         line = cls(size)
-        for i, _ in enumerate(line):
-            if i != hole:
-                line[i] = Mino.GARBAGE
+        line._cells = bytearray([Mino.GARBAGE.value]) * size
+        line.mask = line.full_mask
+        line.hash = _garbage_hash(size)
+        for hole in holes:
+            if line.mask >> hole & 1:
+                line._cells[hole] = Mino.EMPTY.value
+                line.mask &= ~(1 << hole)
+                line.hash ^= CELL_KEYS[hole][Mino.GARBAGE.value]
         return line
+
+
+@lru_cache
+def _garbage_hash(size: int) -> int:
+    """The hash of a line of `size` garbage cells."""
+    return _hash(bytearray([Mino.GARBAGE.value]) * size)
+
+
+def _hash(cells: bytearray) -> int:
+    """XORs the Zobrist keys of all cells."""
+    result = 0
+    for keys, value in zip(CELL_KEYS, cells):
+        result ^= keys[value]
+    return result
@@ -1,15 +1,15 @@
 """The current piece controlled by the player."""
 
-import copy
 from dataclasses import InitVar, dataclass, field
 from typing import TYPE_CHECKING, Iterable
 
-from common.enum import Direction, Mino, Rotation
+from common.enum import Mino
+from common.vector import Vector2D
 
 if TYPE_CHECKING:
-    from common.vector import Vector2D
     from model.board import Board
     from model.ruleset import Ruleset
+    from model.shape import Shape
 
 
 @dataclass
@@ -18,12 +18,12 @@ class BasePiece:
     coordinates."""
 
     mino: Mino
-    _all_coords: "list[list[Vector2D]]"
+    _shapes: "tuple[Shape, ...]"
 
     @property
-    def base_coords(self) -> "list[Vector2D]":
+    def base_coords(self) -> "tuple[Vector2D, ...]":
         """The base coordinates without considering the origin."""
-        return self._all_coords[0]
+        return self._shapes[0].coords
 
 
 @dataclass
@@ -36,7 +36,12 @@ class GhostPiece(BasePiece):
     @property
     def coords(self) -> "Iterable[Vector2D]":
         """The coordinates occupied by the piece."""
-        return (coord + self.origin for coord in self._all_coords[self.rot])
+        return (coord + self.origin for coord in self._shapes[self.rot].coords)
+
+    @property
+    def shape(self) -> "Shape":
+        """The compiled shape at the current rotation."""
+        return self._shapes[self.rot]
 
     def soft_drop(self, board: "Board") -> int:
         """Drops piece down until there is a collision.
@@ -44,21 +49,44 @@ class GhostPiece(BasePiece):
         Returns:
             The number of rows moved.
         """
-        steps = 0
-        while self.try_move(Direction.DOWN, board):
-            steps += 1
+        shape = self._shapes[self.rot]
+        steps = board.drop_distance(shape, self.origin.x, self.origin.y)
+        if steps > 0:
+            self.origin = Vector2D(self.origin.x, self.origin.y - steps)
         return steps
 
     def try_move(self, displacement: "Vector2D", board: "Board") -> bool:
-        """Returns a list of coordinates if moved by the provided
-        `displacement`.
+        """Moves the piece by the provided `displacement` if the destination is
+        free.
+
+        Returns:
+            True if the piece has moved.
         """
-        tmp = copy.deepcopy(self)
-        tmp._move(displacement)  # pylint: disable=protected-access
-        if not board.has_collision(tmp.coords):
-            self._move(displacement)
-            return True
-        return False
+        if board.has_collision_at(
+            self._shapes[self.rot],
+            self.origin.x + displacement.x,
+            self.origin.y + displacement.y,
+        ):
+            return False
+        self._move(displacement)
+        return True
+
+    def shift(self, dx: int, steps: int, board: "Board") -> int:
+        """Moves the piece horizontally by up to `steps` cells in the direction
+        of `dx`, stopping before the first collision.
+
+        Returns:
+            The number of cells moved.
+        """
+        shape = self._shapes[self.rot]
+        x, y = self.origin.x, self.origin.y
+        moved = 0
+        while moved < steps and not board.has_collision_at(shape, x + dx, y):
+            x += dx
+            moved += 1
+        if moved:
+            self.origin = Vector2D(x, y)
+        return moved
 
     def _move(self, displacement: "Vector2D") -> None:
         self.origin += displacement
@@ -71,49 +99,39 @@ class Piece(GhostPiece):
     ruleset: InitVar["Ruleset"]
 
     _num_rots: int = field(init=False)
-    _kicks: "dict[Rotation, dict[int, list[Vector2D]]]" = field(init=False)
+    _kicks: "dict[tuple[int, int], tuple[tuple[int, int], ...]]" = field(init=False)
 
     def __init__(self, ruleset: "Ruleset", mino: Mino) -> None:
-        all_coords = [ruleset.get_coords(mino, rot) for rot in range(ruleset.num_rots)]
-        super().__init__(mino, all_coords, 0, ruleset.get_origin(mino))
+        super().__init__(mino, ruleset.shapes[mino], 0, ruleset.get_origin(mino))
         self.__post_init__(ruleset)
 
     def __post_init__(self, ruleset: "Ruleset") -> None:
         self._num_rots = ruleset.num_rots
-        self._kicks = ruleset.polyminos[self.mino].kicks
+        self._kicks = ruleset.kick_tables[self.mino]
 
     @property
     def base(self) -> "BasePiece":
         """A ghost version of the current, which contains less data."""
-        return BasePiece(self.mino, self._all_coords)
+        return BasePiece(self.mino, self._shapes)
 
     @property
     def ghost(self) -> "GhostPiece":
         """A ghost version of the current, which contains less data."""
-        return GhostPiece(self.mino, self._all_coords, self.rot, self.origin)
+        return GhostPiece(self.mino, self._shapes, self.rot, self.origin)
 
     def try_rotate(self, dr: int, board: "Board") -> bool:
-        """Returns possible a list of possible coordinates after rotating by
-        `dr`.
+        """Rotates the piece by `dr` using the first kick offset which does not
+        collide.
+
+        Returns:
+            True if the piece has rotated.
         """
-        rotation = Rotation.CW if dr > 0 else Rotation.CCW
-        rot_dst = (self.rot + dr) % 4
-        for displacement in self._get_kicks(rotation, rot_dst):
-            tmp = copy.deepcopy(self)
-            tmp._rotate(displacement, dr)  # pylint: disable=protected-access
-            if not board.has_collision(tmp.coords):
-                self._rotate(displacement, dr)
+        rot_dst = (self.rot + dr) % self._num_rots
+        shape = self._shapes[rot_dst]
+        x, y = self.origin.x, self.origin.y
+        for dx, dy in self._kicks.get((self.rot, rot_dst), ()):
+            if not board.has_collision_at(shape, x + dx, y + dy):
+                self.origin = Vector2D(x + dx, y + dy)
+                self.rot = rot_dst
                 return True
         return False
-
-    def _get_kicks(self, rotation: Rotation, rot_dst: int) -> "list[Vector2D]":
-        """Returns the kick data for the mino at the specified rotation
-        configuration.
-        """
-        if rotation not in self._kicks:
-            return []
-        return self._kicks[rotation][rot_dst]
-
-    def _rotate(self, displacement: "Vector2D", dr: int) -> None:
-        self._move(displacement)
-        self.rot = (self.rot + dr) % self._num_rots
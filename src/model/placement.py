@@ -0,0 +1,126 @@
+"""Enumerates the resting placements a piece can reach."""
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Protocol
+
+from common.enum import Action
+
+if TYPE_CHECKING:
+    from common.enum import Mino
+    from model.ruleset import Ruleset
+    from model.shape import Shape
+
+MOVES = ((Action.MOVE_LEFT, -1), (Action.MOVE_RIGHT, 1))
+ROTATIONS = ((Action.ROTATE_CW, 1), (Action.ROTATE_CCW, -1))
+
+
+class Occupancy(Protocol):
+    """The collision queries the search needs, offered by `Board` and by the
+    occupancy-only `Field` of the bot.
+    """
+
+    @property
+    def key(self) -> tuple[int, ...]:
+        """Occupancy masks of all rows, bottom row first."""
+
+    def drop_distance(self, shape: "Shape", x: int, y: int) -> int:
+        """Rows `shape` at (`x`, `y`) can drop before landing."""
+
+    def has_collision_at(self, shape: "Shape", x: int, y: int) -> bool:
+        """Checks if `shape` at (`x`, `y`) has collision."""
+
+
+@dataclass(frozen=True)
+class Placement:
+    """Resting position of a piece: origin and rotation."""
+
+    # pylint: disable=invalid-name
+    x: int
+    y: int
+    rot: int
+
+
+@dataclass
+class PlacementFinder:
+    """Enumerates every resting placement a piece can reach from its spawn
+    position through moves, soft drops and kicked rotations. Results are
+    memoized by mino and board occupancy.
+    """
+
+    _ruleset: "Ruleset"
+    _max_size: int = 4096
+    _cache: "OrderedDict[tuple, dict[Placement, tuple[Action, ...]]]" = field(
+        default_factory=OrderedDict, init=False
+    )
+
+    def find(
+        self, board: Occupancy, mino: "Mino"
+    ) -> dict[Placement, tuple[Action, ...]]:
+        """Returns each reachable resting placement mapped to one shortest input
+        path, ending with a hard drop. The returned dict is shared with the
+        cache and must not be modified.
+        """
+        key = (mino, board.key)
+        if (placements := self._cache.get(key)) is not None:
+            self._cache.move_to_end(key)
+            return placements
+        placements = self._search(board, mino)
+        self._cache[key] = placements
+        if len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+        return placements
+
+    def clear(self) -> None:
+        """Clears memoized results."""
+        self._cache.clear()
+
+    def _search(
+        self, board: Occupancy, mino: "Mino"
+    ) -> dict[Placement, tuple[Action, ...]]:
+        # pylint: disable=too-many-locals
+        shapes = self._ruleset.shapes[mino]
+        kicks = self._ruleset.kick_tables[mino]
+        num_rots = self._ruleset.num_rots
+        origin = self._ruleset.get_origin(mino)
+        start = (origin.x, origin.y, 0)
+        if board.has_collision_at(shapes[0], origin.x, origin.y):
+            return {}
+
+        parents: dict[tuple[int, int, int], tuple[tuple[int, int, int], Action]] = {}
+        queue = deque([start])
+        placements: dict[Placement, tuple[Action, ...]] = {}
+
+        def visit(state: tuple[int, int, int], prev: tuple, action: Action) -> None:
+            if state not in parents and state != start:
+                parents[state] = (prev, action)
+                queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            x, y, rot = state
+            shape = shapes[rot]
+            drop = board.drop_distance(shape, x, y)
+            placement = Placement(x, y - drop, rot)
+            if placement not in placements:
+                placements[placement] = self._backtrack(parents, start, state)
+            if drop > 0:
+                visit((x, y - drop, rot), state, Action.SOFT_DROP)
+            for action, dx in MOVES:
+                if not board.has_collision_at(shape, x + dx, y):
+                    visit((x + dx, y, rot), state, action)
+            for action, dr in ROTATIONS:
+                rot_dst = (rot + dr) % num_rots
+                for dx, dy in kicks.get((rot, rot_dst), ()):
+                    if not board.has_collision_at(shapes[rot_dst], x + dx, y + dy):
+                        visit((x + dx, y + dy, rot_dst), state, action)
+                        break
+        return placements
+
+    @staticmethod
+    def _backtrack(parents: dict, start: tuple, state: tuple) -> tuple[Action, ...]:
+        path = [Action.HARD_DROP]
+        while state != start:
+            state, action = parents[state]
+            path.append(action)
+        return tuple(reversed(path))
@@ -0,0 +1,132 @@
+"""Piece randomizers which feed the bag."""
+
+import random
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable
+
+from common.enum import Mino
+
+# Minos which a history randomizer never deals first.
+FIRST_EXCLUDED = (Mino.S, Mino.Z, Mino.O)
+# Initial history of a history randomizer.
+FIRST_HISTORY = (Mino.Z, Mino.S, Mino.S, Mino.Z)
+
+
+@dataclass
+class Randomizer(ABC):
+    """Endless, seedable source of minos.
+
+    Subclasses implement `generate`, which deals a block of pieces in one call.
+    The sequence only depends on the generator, not on the block sizes it is
+    drawn in.
+    """
+
+    _minos: list[Mino]
+    _rng: random.Random = field(default_factory=random.Random)
+
+    def __iter__(self) -> "Randomizer":
+        return self
+
+    def __next__(self) -> Mino:
+        return self.generate(1)[0]
+
+    @abstractmethod
+    def generate(self, count: int) -> list[Mino]:
+        """Deals the next `count` minos."""
+
+    def snapshot(self) -> Any:
+        """Captures the state of the randomizer, apart from its generator."""
+        return None
+
+    def restore(self, state: Any) -> None:
+        """Returns the randomizer to a state captured by `snapshot`."""
+
+
+@dataclass
+class BagRandomizer(Randomizer):
+    """Deals every mino `copies` times in a random order, then reshuffles."""
+
+    copies: int = 1
+    _bag: list[Mino] = field(init=False)
+    _index: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self._bag = self._minos * self.copies
+        self._rng.shuffle(self._bag)
+
+    def generate(self, count: int) -> list[Mino]:
+        minos: list[Mino] = []
+        while len(minos) < count:
+            end = min(self._index + count - len(minos), len(self._bag))
+            minos.extend(self._bag[self._index : end])
+            self._index = end
+            if self._index == len(self._bag):
+                self._rng.shuffle(self._bag)
+                self._index = 0
+        return minos
+
+    def snapshot(self) -> tuple[tuple[Mino, ...], int]:
+        return tuple(self._bag), self._index
+
+    def restore(self, state: tuple[tuple[Mino, ...], int]) -> None:
+        self._bag[:], self._index = state
+
+
+@dataclass
+class PureRandomizer(Randomizer):
+    """Deals every mino independently with equal probability."""
+
+    def generate(self, count: int) -> list[Mino]:
+        return self._rng.choices(self._minos, k=count)
+
+
+@dataclass
+class HistoryRandomizer(Randomizer):
+    """Rerolls minos found in the last few dealt, up to `rolls` times, as in
+    TGM. The first mino is never one of `FIRST_EXCLUDED`.
+    """
+
+    rolls: int = 6
+    _history: "deque[Mino]" = field(init=False)
+    _started: bool = field(default=False, init=False)
+
+    def __post_init__(self) -> None:
+        if self.rolls < 1:
+            raise ValueError(f"At least one roll is required: {self.rolls}")
+        self._history = deque(FIRST_HISTORY, maxlen=len(FIRST_HISTORY))
+
+    def generate(self, count: int) -> list[Mino]:
+        minos: list[Mino] = []
+        choice = self._rng.choice
+        for _ in range(count):
+            if not self._started:
+                first = [m for m in self._minos if m not in FIRST_EXCLUDED]
+                mino = choice(first or self._minos)
+                self._started = True
+            else:
+                for _ in range(self.rolls):
+                    mino = choice(self._minos)
+                    if mino not in self._history:
+                        break
+            self._history.append(mino)
+            minos.append(mino)
+        return minos
+
+    def snapshot(self) -> tuple[tuple[Mino, ...], bool]:
+        return tuple(self._history), self._started
+
+    def restore(self, state: tuple[tuple[Mino, ...], bool]) -> None:
+        history, self._started = state
+        self._history.clear()
+        self._history.extend(history)
+
+
+RANDOMIZERS: dict[str, Callable[[list[Mino], random.Random], Randomizer]] = {
+    "bag7": BagRandomizer,
+    "bag14": partial(BagRandomizer, copies=2),
+    "random": PureRandomizer,
+    "history": HistoryRandomizer,
+}
@@ -1,17 +1,20 @@
 """Ruleset."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import yaml
 
-from common.enum import Mino
+from common.config_cache import cache_path, load_cached
+from common.enum import Mino, Rotation
 from common.vector import Vector2D
+from model.piece import BasePiece
 from model.polymino import Polymino
+from model.shape import Shape
 
 
 @dataclass
-class Ruleset:
+class Ruleset:  # pylint: disable=too-many-instance-attributes
     """Ruleset, determines the positions and kicks of the pieces."""
 
     difficulty: int
@@ -21,6 +24,32 @@ class Ruleset:
     num_visible_rows: int
     num_previews: int
     polyminos: dict[Mino, Polymino]
+    randomizer: str = "bag7"
+    messiness: float = 1.0
+    num_holes: int = 1
+
+    shapes: dict[Mino, tuple[Shape, ...]] = field(init=False)
+    kick_tables: dict[Mino, dict[tuple[int, int], tuple[tuple[int, int], ...]]] = (
+        field(init=False)
+    )
+    base_pieces: dict[Mino, BasePiece] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.shapes = {
+            mino: tuple(
+                Shape.from_coords(
+                    _rotate(coord, poly.width, rot) for coord in poly.coords
+                )
+                for rot in range(self.num_rots)
+            )
+            for mino, poly in self.polyminos.items()
+        }
+        self.kick_tables = {
+            mino: self._compile_kicks(poly) for mino, poly in self.polyminos.items()
+        }
+        self.base_pieces = {
+            mino: BasePiece(mino, shapes) for mino, shapes in self.shapes.items()
+        }
 
     @property
     def mino_types(self) -> list[Mino]:
@@ -37,16 +66,50 @@ class Ruleset:
         """Returns the coordinates of the specified mino at the specified
         rotation.
         """
-        poly = self.polyminos[mino]
-        return [_rotate(coord, poly.width, rot) for coord in poly.coords]
+        return list(self.shapes[mino][rot % self.num_rots].coords)
+
+    def get_kicks(
+        self, mino: Mino, rot_src: int, rot_dst: int
+    ) -> tuple[tuple[int, int], ...]:
+        """Returns the kick offsets of the specified mino when rotating from
+        `rot_src` to `rot_dst`. Empty if the rotation is not allowed.
+        """
+        return self.kick_tables[mino].get((rot_src, rot_dst), ())
 
     def get_origin(self, mino: Mino) -> Vector2D:
         """Returns the coordinates of the specified mino."""
         return self.polyminos[mino].origin
 
+    def _compile_kicks(
+        self, poly: Polymino
+    ) -> dict[tuple[int, int], tuple[tuple[int, int], ...]]:
+        """Flattens the kick data of a polymino into (source rotation,
+        destination rotation) keyed offsets.
+        """
+        table = {}
+        for rotation, kicks in poly.kicks.items():
+            dr = 1 if rotation == Rotation.CW else -1
+            for rot_dst, offsets in kicks.items():
+                rot_src = (rot_dst - dr) % self.num_rots
+                table[rot_src, rot_dst] = tuple((kick.x, kick.y) for kick in offsets)
+        return table
+
     @classmethod
     def from_config(cls, settings_path: Path, config_path: Path) -> "Ruleset":
-        """Constructs Ruleset object from a config file."""
+        """Constructs Ruleset object from a config file. The compiled ruleset
+        is cached next to the config file, one cache per settings file, until
+        either file or the code which compiles them changes.
+        """
+        return load_cached(
+            cache_path(config_path, others=[settings_path]),
+            [settings_path, config_path],
+            lambda: cls.parse_config(settings_path, config_path),
+            [cls, Shape, BasePiece, Polymino, Vector2D],
+        )
+
+    @classmethod
+    def parse_config(cls, settings_path: Path, config_path: Path) -> "Ruleset":
+        """Constructs Ruleset object from a config file, without the cache."""
         with open(settings_path, encoding="utf8") as infile:
             setting = yaml.safe_load(infile.read())
         difficulty = min(max(int(setting["difficulty"]), 1), 4)
@@ -58,6 +121,19 @@ class Ruleset:
             for mino_type, mino_cfg in cfg["polyminos"].items()
         }
 
+        messiness = float(setting.get("messiness", 1.0))
+        if not 0.0 <= messiness <= 1.0:
+            raise ValueError(
+                f"Invalid messiness in {settings_path}: {messiness}, expected a "
+                "chance between 0 and 1."
+            )
+        num_holes = int(setting.get("num_holes", 1))
+        if not 1 <= num_holes < cfg["num_cols"]:
+            raise ValueError(
+                f"Invalid num_holes in {settings_path}: {num_holes}, expected at "
+                f"least 1 and fewer than the {cfg['num_cols']} columns."
+            )
+
         return cls(
             difficulty,
             cfg["num_cols"],
@@ -66,6 +142,9 @@ class Ruleset:
             cfg["num_visible_rows"],
             cfg["num_previews"],
             polyminos,
+            cfg.get("randomizer", "bag7"),
+            messiness,
+            num_holes,
         )
 
 
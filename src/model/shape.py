@@ -0,0 +1,50 @@
+"""Immutable cell layout of a polymino at one rotation."""
+
+from dataclasses import dataclass
+from typing import Iterable
+
+from common.vector import Vector2D
+
+
+@dataclass(frozen=True)
+class Shape:  # pylint: disable=too-many-instance-attributes
+    """Immutable cell layout of a polymino at one rotation, relative to the
+    piece origin. Compiled once by the ruleset and shared by every piece.
+    """
+
+    coords: tuple[Vector2D, ...]
+    cells: tuple[tuple[int, int], ...]
+    rows: tuple[tuple[int, int], ...]
+    bottoms: tuple[tuple[int, int], ...]
+    left: int
+    right: int
+    bottom: int
+    top: int
+
+    @classmethod
+    def from_coords(cls, coords: Iterable[Vector2D]) -> "Shape":
+        """Constructs from the relative coordinates of each cell.
+
+        `rows` holds one (dy, bits) entry per occupied row, where bit `i` of
+        `bits` is set when the cell at column `i` is occupied. `bottoms` holds
+        the cells with no cell of the shape directly below them, which are the
+        only cells that can land on the stack.
+        """
+        coords = tuple(coords)
+        cells = tuple((coord.x, coord.y) for coord in coords)
+        row_masks: dict[int, int] = {}
+        for x, y in cells:
+            row_masks[y] = row_masks.get(y, 0) | 1 << x
+        bottoms = tuple(cell for cell in cells if (cell[0], cell[1] - 1) not in cells)
+        xs = [x for x, _ in cells]
+        ys = [y for _, y in cells]
+        return cls(
+            coords,
+            cells,
+            tuple(sorted(row_masks.items())),
+            bottoms,
+            min(xs),
+            max(xs),
+            min(ys),
+            max(ys),
+        )
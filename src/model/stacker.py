@@ -2,13 +2,14 @@
 
 import random
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from common.enum import Direction
 from model.bag import Bag
-from model.board import Board
-from model.line import Line
+from model.board import Board, BoardSnapshot
+from model.garbage import CheeseGenerator
 from model.piece import BasePiece, Piece
+from model.zobrist import HELD_THIS_TURN_KEY, HOLD_KEYS, piece_key
 
 if TYPE_CHECKING:
     from common.enum import Mino
@@ -16,27 +17,77 @@ if TYPE_CHECKING:
     from model.ruleset import Ruleset
 
 
+@dataclass(frozen=True)
+class Snapshot:  # pylint: disable=too-many-instance-attributes
+    """The state of a stacker at one point of a game, including the state of
+    its generator, so that the same pieces and cheese follow a restore.
+    """
+
+    board: BoardSnapshot
+    current: "GhostPiece"
+    bag: Any
+    cheese: tuple[int, ...]
+    rng: tuple
+    held: "Mino | None"
+    held_this_turn: bool
+    hold_hash: int
+    topped_out: bool
+    num_pieces: int
+    lines_cleared: int
+    garbage_cleared: int
+
+
 @dataclass
 class Stacker:  # pylint: disable=too-many-instance-attributes
-    """Stacker engine."""
+    """Stacker engine.
+
+    With `keep_history`, the state at the start of every piece is kept so that
+    placements can be undone and redone without limit.
+
+    Snapshots capture the state of `rng` only after the stacker has drawn from
+    it since the last capture, so `rng` must not be used by anything else.
+    """
 
     _ruleset: "Ruleset"
+    rng: random.Random = field(default_factory=random.Random)
+    keep_history: bool = False
 
     board: Board = field(init=False)
     current: Piece = field(init=False)
     _bag: Bag = field(init=False)
+    _cheese: CheeseGenerator = field(init=False)
     _held: "Mino | None" = field(default=None, init=False)
     _held_this_turn: bool = field(default=False, init=False)
+    _hold_hash: int = field(default=0, init=False)
     _garbage_interval: int = field(init=False)
     _num_pieces: int = field(default=0, init=False)
+    lines_cleared: int = field(default=0, init=False)
+    garbage_cleared: int = field(default=0, init=False)
+    topped_out: bool = field(default=False, init=False)
+    _rng_state: tuple = field(default=(), init=False)
+    _rng_current: bool = field(default=False, init=False)
+    _turn: Snapshot | None = field(default=None, init=False)
+    _undo: list[Snapshot] = field(default_factory=list, init=False)
+    _redo: list[Snapshot] = field(default_factory=list, init=False)
 
     def __post_init__(self) -> None:
         self._garbage_interval = 6 - self._ruleset.difficulty
         self.board = Board(self._ruleset.num_cols, self._ruleset.num_rows)
-        self._bag = Bag(self._ruleset)
-        for _ in range(10):
-            self._generate_cheese()
+        self._bag = Bag(self._ruleset, self.rng)
+        self._cheese = CheeseGenerator(
+            self._ruleset.num_cols,
+            self.rng,
+            self._ruleset.messiness,
+            self._ruleset.num_holes,
+        )
+        self._generate_cheese(10)
         self._spawn_from_bag()
+        self._start_turn()
+
+    @property
+    def can_hold(self) -> bool:
+        """Flag to indicate if the current piece can still be held."""
+        return not self._held_this_turn
 
     @property
     def ghost(self) -> "GhostPiece":
@@ -45,29 +96,44 @@ class Stacker:  # pylint: disable=too-many-instance-attributes
         ghost.soft_drop(self.board)
         return ghost
 
+    @property
+    def hash(self) -> int:
+        """Zobrist hash of the board, current piece, hold and preview queue."""
+        origin = self.current.origin
+        return (
+            self.board.hash
+            ^ self._bag.hash
+            ^ self._hold_hash
+            ^ piece_key(self.current.mino, self.current.rot, origin.x, origin.y)
+        )
+
     @property
     def held(self) -> BasePiece | None:
         """The held piece."""
         if self._held is None:
             return None
-        return BasePiece(self._held, self._ruleset.get_all_coords(self._held))
+        return self._ruleset.base_pieces[self._held]
 
     @property
     def previews(self) -> list[BasePiece]:
         """The preview pieces."""
-        return [
-            BasePiece(mino, self._ruleset.get_all_coords(mino))
-            for mino in self._bag.previews
-        ]
+        return [self._ruleset.base_pieces[mino] for mino in self._bag.previews]
 
     def hard_drop(self) -> None:
         """Drops current piece to the bottom and spawns new piece."""
+        if self._turn is not None:
+            self._undo.append(self._turn)
+            self._redo.clear()
         self.current.soft_drop(self.board)
         self.board.finalize(self.current)
-        self.board.sift()
+        removed = self.board.sift()
+        self.lines_cleared += len(removed)
+        self.garbage_cleared += sum(line.is_garbage for line in removed)
         self._calculate_cheese()
         self._spawn_from_bag()
         self._held_this_turn = False
+        self._hold_hash = 0 if self._held is None else HOLD_KEYS[self._held.value]
+        self._start_turn()
 
     def hold(self) -> None:
         """Holds the current piece, swaps with previously held piece is
@@ -82,6 +148,7 @@ class Stacker:  # pylint: disable=too-many-instance-attributes
             self._spawn_from_bag()
         self._held = prev
         self._held_this_turn = True
+        self._hold_hash = HOLD_KEYS[prev.value] ^ HELD_THIS_TURN_KEY
 
     def move_horizontal(self, dx: int) -> bool:
         """Moves the piece horizontally."""
@@ -89,11 +156,25 @@ class Stacker:  # pylint: disable=too-many-instance-attributes
             Direction.LEFT if dx < 0 else Direction.RIGHT, self.board
         )
 
+    def shift_horizontal(self, dx: int, steps: int) -> int:
+        """Moves the piece horizontally by up to `steps` cells.
+
+        Returns:
+            The number of cells moved.
+        """
+        return self.current.shift(-1 if dx < 0 else 1, steps, self.board)
+
     def reset(self) -> None:
         """Resets game to a fresh state."""
         self._held = None
         self._held_this_turn = False
+        self._hold_hash = 0
         self._num_pieces = 0
+        self.lines_cleared = 0
+        self.garbage_cleared = 0
+        self.topped_out = False
+        self._undo.clear()
+        self._redo.clear()
         self.__post_init__()
 
     def rotate(self, dr: int) -> bool:
@@ -104,6 +185,77 @@ class Stacker:  # pylint: disable=too-many-instance-attributes
         """Drops current piece to the bottom."""
         return self.current.soft_drop(self.board) > 0
 
+    def snapshot(self) -> Snapshot:
+        """Captures the state of the game. The board lines are shared with the
+        snapshot rather than copied.
+        """
+        if not self._rng_current:
+            rng_state = self.rng.getstate()
+            if rng_state != self._rng_state:  # otherwise share the previous one
+                self._rng_state = rng_state
+            self._rng_current = True
+        return Snapshot(
+            self.board.snapshot(),
+            self.current.ghost,
+            self._bag.snapshot(),
+            self._cheese.snapshot(),
+            self._rng_state,
+            self._held,
+            self._held_this_turn,
+            self._hold_hash,
+            self.topped_out,
+            self._num_pieces,
+            self.lines_cleared,
+            self.garbage_cleared,
+        )
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """Returns the game to `snapshot`, which stays valid. The undo history
+        is left untouched.
+        """
+        self.board.restore(snapshot.board)
+        self.current = Piece(self._ruleset, snapshot.current.mino)
+        self.current.rot = snapshot.current.rot
+        self.current.origin = snapshot.current.origin
+        self._bag.restore(snapshot.bag)
+        self._cheese.restore(snapshot.cheese)
+        if snapshot.rng is not self._rng_state or not self._rng_current:
+            self.rng.setstate(snapshot.rng)
+            self._rng_state = snapshot.rng
+            self._rng_current = True
+        self._held = snapshot.held
+        self._held_this_turn = snapshot.held_this_turn
+        self._hold_hash = snapshot.hold_hash
+        self._num_pieces = snapshot.num_pieces
+        self.lines_cleared = snapshot.lines_cleared
+        self.garbage_cleared = snapshot.garbage_cleared
+        self.topped_out = snapshot.topped_out
+
+    def undo(self) -> bool:
+        """Returns to the start of the previous piece, before it was placed.
+
+        Returns:
+            True if there was a placement to undo.
+        """
+        if not self._undo or self._turn is None:
+            return False
+        self._redo.append(self._turn)
+        self._turn = self._undo.pop()
+        self.restore(self._turn)
+        return True
+
+    def redo(self) -> bool:
+        """Places the piece of the last undo again, as it was placed before.
+
+        Returns:
+            True if there was a placement to redo.
+        """
+        if not self._redo or self._turn is None:
+            return False
+        self._undo.append(self._turn)
+        self._turn = self._redo.pop()
+        self.restore(self._turn)
+        return True
 
     def _calculate_cheese(self) -> None:
         self._num_pieces += 1
@@ -111,20 +263,22 @@ class Stacker:  # pylint: disable=too-many-instance-attributes
             self._generate_cheese()
             self._num_pieces %= self._garbage_interval
 
-    def _generate_cheese(self) -> None:
-        self.board.insert_below(
-            Line.as_garbage(
-                self._ruleset.num_cols, random.randrange(self._ruleset.num_cols)
-            )
-        )
+    def _start_turn(self) -> None:
+        if self.keep_history:
+            self._turn = self.snapshot()
+
+    def _generate_cheese(self, count: int = 1) -> None:
+        self._rng_current = False
+        self.board.insert_below_many(self._cheese.generate(count))
 
     def _spawn(self, mino: "Mino") -> None:
         piece = Piece(self._ruleset, mino)
         if self.board.has_collision(piece.coords):
-            print("occupied")
+            self.topped_out = True
             return
         self.current = piece
 
     def _spawn_from_bag(self) -> None:
         """Spawns next polymino from bag."""
+        self._rng_current = False
         self._spawn(self._bag.next)
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""Size-bounded cache of search results keyed by state hash."""
+
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+from common.enum import Replacement
+
+T = TypeVar("T")
+
+
+@dataclass
+class TranspositionTable(Generic[T]):
+    """Size-bounded cache of search results keyed by state hash. Each hash maps
+    to one slot; when two hashes share a slot, `policy` decides which entry is
+    kept:
+
+    - ALWAYS: the new entry replaces the old one.
+    - DEPTH: the new entry replaces the old one if it was searched at least as
+      deep.
+    - KEEP: the old entry is kept until it is cleared.
+
+    An entry for the same hash is always updated.
+    """
+
+    size: int = 1 << 16
+    policy: Replacement = Replacement.DEPTH
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _slots: "list[tuple[int, int, T] | None]" = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._slots = [None] * self.size
+
+    def __len__(self) -> int:
+        return sum(entry is not None for entry in self._slots)
+
+    def clear(self) -> None:
+        """Removes all entries and resets the counters."""
+        self._slots = [None] * self.size
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: int, min_depth: int = 0) -> T | None:
+        """Returns the value stored for `key` if it was searched at least
+        `min_depth` deep.
+        """
+        entry = self._slots[key % self.size]
+        if entry is None or entry[0] != key or entry[1] < min_depth:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[2]
+
+    def store(self, key: int, value: T, depth: int = 0) -> bool:
+        """Stores `value` for `key`, subject to the replacement policy.
+
+        Returns:
+            True if the value was stored.
+        """
+        index = key % self.size
+        entry = self._slots[index]
+        if entry is not None and entry[0] != key:
+            if self.policy == Replacement.KEEP:
+                return False
+            if self.policy == Replacement.DEPTH and depth < entry[1]:
+                return False
+        self._slots[index] = (key, depth, value)
+        return True
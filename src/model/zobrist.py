@@ -0,0 +1,64 @@
+"""Zobrist keys for hashing the game state.
+
+The keys are drawn from a fixed seed so hashes agree across processes and runs.
+All hashes are unsigned 64-bit integers.
+"""
+
+import random
+from functools import lru_cache
+
+from common.enum import Mino
+
+MASK = (1 << 64) - 1
+MAX_COLS = 64
+MAX_COORD = 128
+COORD_OFFSET = 32
+
+_rng = random.Random(0x5EED)
+
+
+def _keys(num_keys: int) -> tuple[int, ...]:
+    return tuple(_rng.getrandbits(64) for _ in range(num_keys))
+
+
+# Indexed by [column][mino value]. Empty cells hash to 0 so empty lines do too.
+CELL_KEYS = tuple(
+    tuple(0 if value == Mino.EMPTY.value else key for value, key in enumerate(keys))
+    for keys in (_keys(len(Mino)) for _ in range(MAX_COLS))
+)
+# Multiplier combining line hashes by row, odd so it is invertible mod 2^64.
+ROW_BASE = _rng.getrandbits(64) | 1
+PIECE_KEYS = _keys(len(Mino))
+ROT_KEYS = _keys(8)
+X_KEYS = _keys(MAX_COORD)
+Y_KEYS = _keys(MAX_COORD)
+HOLD_KEYS = _keys(len(Mino))
+HELD_THIS_TURN_KEY = _rng.getrandbits(64)
+# Indexed by [preview index][mino value].
+QUEUE_KEYS = tuple(_keys(len(Mino)) for _ in range(32))
+
+
+@lru_cache
+def row_powers(num_rows: int) -> tuple[int, ...]:
+    """Returns `ROW_BASE` raised to each row index, modulo 2^64."""
+    return tuple(pow(ROW_BASE, row, 1 << 64) for row in range(num_rows))
+
+
+@lru_cache
+def inverse_row_power(count: int) -> int:
+    """Returns the inverse of `ROW_BASE` raised to `count`, modulo 2^64, which
+    moves a combined hash down by `count` rows.
+    """
+    return pow(ROW_BASE, -count, 1 << 64)
+
+
+def piece_key(mino: Mino, rot: int, x: int, y: int) -> int:
+    """Returns the key of a piece of `mino` at rotation `rot` and origin
+    (`x`, `y`).
+    """
+    return (
+        PIECE_KEYS[mino.value]
+        ^ ROT_KEYS[rot]
+        ^ X_KEYS[x + COORD_OFFSET]
+        ^ Y_KEYS[y + COORD_OFFSET]
+    )
@@ -0,0 +1,44 @@
+"""Self-play launch script. Plays many games in parallel without pygame."""
+
+import argparse
+import dataclasses
+import json
+
+from common.cli import add_ruleset_arguments
+from model.randomizer import RANDOMIZERS
+from model.ruleset import Ruleset
+from simulation.policy import POLICIES
+from simulation.selfplay import Game, SelfPlay
+
+
+def parse_args() -> argparse.Namespace:
+    """Parses command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=100, help="number of games")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--max-pieces", type=int, default=1000)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--difficulty", type=int, default=None)
+    parser.add_argument("--randomizer", choices=sorted(RANDOMIZERS), default=None)
+    add_ruleset_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    """Streams one JSON line per finished game."""
+    args = parse_args()
+    ruleset = Ruleset.from_config(args.settings, args.ruleset)
+    if args.difficulty is not None:
+        ruleset = dataclasses.replace(ruleset, difficulty=args.difficulty)
+    if args.randomizer is not None:
+        ruleset = dataclasses.replace(ruleset, randomizer=args.randomizer)
+
+    game = Game(ruleset, POLICIES[args.policy], args.max_pieces)
+    seeds = range(args.seed, args.seed + args.games)
+    for result in SelfPlay(game, args.workers).run(seeds):
+        print(json.dumps(dataclasses.asdict(result)), flush=True)
+
+
+if __name__ == "__main__":
+    main()
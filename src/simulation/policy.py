@@ -0,0 +1,39 @@
+"""Placement policies used by self-play. Policies which make random choices
+draw from the generator they are given, never from the global one.
+"""
+
+import random
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from common.enum import Action
+    from model.placement import Placement
+    from model.stacker import Stacker
+
+Policy = Callable[
+    ["Stacker", "dict[Placement, tuple[Action, ...]]", random.Random], "Placement"
+]
+
+
+def random_policy(
+    _stacker: "Stacker",
+    placements: "dict[Placement, tuple[Action, ...]]",
+    rng: random.Random,
+) -> "Placement":
+    """Picks a reachable placement uniformly at random."""
+    return rng.choice(list(placements))
+
+
+def lowest_policy(
+    _stacker: "Stacker",
+    placements: "dict[Placement, tuple[Action, ...]]",
+    _rng: random.Random,
+) -> "Placement":
+    """Picks the placement with the lowest origin, leftmost first."""
+    return min(placements, key=lambda placement: (placement.y, placement.x))
+
+
+POLICIES: "dict[str, Policy]" = {
+    "random": random_policy,
+    "lowest": lowest_policy,
+}
@@ -0,0 +1,110 @@
+"""Drives the stacker engine without a display."""
+
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable
+
+from common.enum import Action, Mino
+
+if TYPE_CHECKING:
+    from common.replay import Replay
+    from model.board import Board
+    from model.stacker import Stacker
+
+
+@dataclass
+class RunStats:
+    """Counters and timing of a headless run."""
+
+    num_actions: int = 0
+    num_pieces: int = 0
+    elapsed_ns: int = 0
+
+    @property
+    def actions_per_sec(self) -> float:
+        """Actions handled per second of engine time."""
+        return self.num_actions * 1e9 / self.elapsed_ns if self.elapsed_ns else 0.0
+
+    @property
+    def pieces_per_sec(self) -> float:
+        """Pieces locked per second of engine time."""
+        return self.num_pieces * 1e9 / self.elapsed_ns if self.elapsed_ns else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"actions: {self.num_actions}, pieces: {self.num_pieces}, "
+            f"time: {self.elapsed_ns / 1e6:.3f} ms, "
+            f"actions/sec: {self.actions_per_sec:.1f}, "
+            f"pieces/sec: {self.pieces_per_sec:.1f}"
+        )
+
+
+@dataclass
+class HeadlessRunner:
+    """Drives the stacker engine without a display."""
+
+    stacker: "Stacker"
+    stats: RunStats = field(default_factory=RunStats, init=False)
+
+    def handle_action(self, action: Action) -> None:
+        """Handles game operations."""
+        match action:
+            case Action.MOVE_LEFT | Action.MOVE_RIGHT:
+                self.stacker.move_horizontal(-1 if action == Action.MOVE_LEFT else 1)
+            case Action.ROTATE_CCW | Action.ROTATE_CW:
+                self.stacker.rotate(1 if action == Action.ROTATE_CW else -1)
+            case Action.SOFT_DROP:
+                self.stacker.soft_drop()
+            case Action.HARD_DROP:
+                self.stacker.hard_drop()
+                self.stats.num_pieces += 1
+            case Action.HOLD:
+                self.stacker.hold()
+            case Action.RESET:
+                self.stacker.reset()
+            case Action.UNDO:
+                self.stacker.undo()
+            case Action.REDO:
+                self.stacker.redo()
+        self.stats.num_actions += 1
+
+    def run(self, actions: Iterable[Action]) -> RunStats:
+        """Handles all `actions` as fast as possible and returns the
+        accumulated stats.
+        """
+        handle_action = self.handle_action
+        start = time.perf_counter_ns()
+        for action in actions:
+            handle_action(action)
+        self.stats.elapsed_ns += time.perf_counter_ns() - start
+        return self.stats
+
+    def play(self, replay: "Replay", realtime: bool = False) -> RunStats:
+        """Handles the actions of `replay`, either as fast as possible or
+        waiting out the recorded delay before each action. The stacker must have
+        been created from the replay seed.
+        """
+        if not realtime:
+            return self.run(action for _, action in replay.events)
+        start = time.perf_counter_ns()
+        deadline = start
+        for delta, action in replay.events:
+            deadline += delta * 1_000_000
+            if (remaining := deadline - time.perf_counter_ns()) > 0:
+                time.sleep(remaining / 1e9)
+            self.handle_action(action)
+        self.stats.elapsed_ns += time.perf_counter_ns() - start
+        return self.stats
+
+
+SYMBOLS = {Mino.EMPTY: ".", Mino.GARBAGE: "#"}
+
+
+def format_board(board: "Board", num_rows: int | None = None) -> str:
+    """Renders the bottom `num_rows` rows of the board as text, top row
+    first.
+    """
+    lines = ["".join(SYMBOLS.get(mino, mino.name) for _, mino in row) for row in board]
+    if num_rows is not None:
+        lines = lines[:num_rows]
+    return "\n".join(reversed(lines))
@@ -0,0 +1,32 @@
+"""Parser for plain-text input scripts."""
+
+from pathlib import Path
+
+from common.enum import Action
+
+
+def parse_script(text: str) -> list[Action]:
+    """Parses an input script into a list of actions.
+
+    Each non-empty line holds an action name as used in the controls config,
+    optionally followed by a repeat count, e.g. `move_left 3`. Everything after
+    a `#` is ignored.
+    """
+    actions: list[Action] = []
+    for line_num, line in enumerate(text.splitlines(), 1):
+        tokens = line.split("#", 1)[0].split()
+        if not tokens:
+            continue
+        try:
+            action = Action[tokens[0].upper()]
+            count = int(tokens[1]) if len(tokens) > 1 else 1
+        except (KeyError, ValueError) as ex:
+            raise ValueError(f"Invalid input on line {line_num}: {line!r}") from ex
+        actions.extend([action] * count)
+    return actions
+
+
+def load_script(script_path: Path) -> list[Action]:
+    """Reads and parses an input script file."""
+    with open(script_path, encoding="utf8") as infile:
+        return parse_script(infile.read())
@@ -0,0 +1,97 @@
+"""Plays many independent games in parallel."""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from model.placement import PlacementFinder
+from model.stacker import Stacker
+from simulation.runner import HeadlessRunner
+
+if TYPE_CHECKING:
+    from model.ruleset import Ruleset
+    from simulation.policy import Policy
+
+
+@dataclass(frozen=True)
+class GameResult:
+    """Outcome of one self-play game."""
+
+    seed: int
+    num_pieces: int
+    lines_cleared: int
+    garbage_cleared: int
+    topped_out: bool
+
+
+@dataclass
+class Game:
+    """Plays one game by asking `policy` for each placement."""
+
+    ruleset: "Ruleset"
+    policy: "Policy"
+    max_pieces: int
+    finder: PlacementFinder | None = None
+
+    def play(self, seed: int) -> GameResult:
+        """Plays a game from `seed` until top out or until `max_pieces` have
+        been placed. The result only depends on the seed.
+
+        The stacker and the policy draw from two generators derived from
+        `seed`, so that the choices of the policy are independent of the
+        pieces and the garbage it plays against.
+        """
+        rng = random.Random(f"policy:{seed}")
+        finder = self.finder or PlacementFinder(self.ruleset)
+        runner = HeadlessRunner(Stacker(self.ruleset, random.Random(f"game:{seed}")))
+        stacker = runner.stacker
+        while runner.stats.num_pieces < self.max_pieces and not stacker.topped_out:
+            placements = finder.find(stacker.board, stacker.current.mino)
+            if not placements:
+                stacker.topped_out = True
+                break
+            runner.run(placements[self.policy(stacker, placements, rng)])
+        return GameResult(
+            seed,
+            runner.stats.num_pieces,
+            stacker.lines_cleared,
+            stacker.garbage_cleared,
+            stacker.topped_out,
+        )
+
+
+_WORKER_GAME: Game | None = None
+
+
+def _init_worker(game: Game) -> None:
+    global _WORKER_GAME  # pylint: disable=global-statement
+    game.finder = PlacementFinder(game.ruleset)
+    _WORKER_GAME = game
+
+
+def _play_in_worker(seed: int) -> GameResult:
+    assert _WORKER_GAME is not None
+    return _WORKER_GAME.play(seed)
+
+
+@dataclass
+class SelfPlay:
+    """Plays many independent games on a process pool, one game per seed."""
+
+    game: Game
+    num_workers: int | None = None
+
+    def run(self, seeds: Iterable[int]) -> Iterator[GameResult]:
+        """Yields the result of each game as soon as it finishes. Results are
+        reproducible from the seeds regardless of the number of workers, but
+        arrive in completion order.
+        """
+        num_workers = self.num_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(
+            num_workers, initializer=_init_worker, initargs=(self.game,)
+        ) as executor:
+            futures = [executor.submit(_play_in_worker, seed) for seed in seeds]
+            for future in as_completed(futures):
+                yield future.result()